@@ -0,0 +1,305 @@
+""" A batched photon path tracing algorithm for a single axis-aligned box.
+
+All live rays are advanced together in lockstep and the ray state is held in
+numpy arrays (one row per ray) rather than `Ray` objects. This removes the per-ray
+Python overhead of `photon_tracer.follow` but only supports the simple scene used
+by luminescent solar concentrators: a box (with centre at the origin) which
+contains the components, inside of a larger world box.
+"""
+import numpy as np
+from pvtrace.light.event import Event
+from pvtrace.material.component import Absorber, Luminophore, Reactor
+from pvtrace.material.utils import accepts_size
+from pvtrace.geometry.utils import EPS_ZERO, slab_intersections
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# *Outward* surface normals corresponding to (xmin, xmax, ymin, ymax, zmin, zmax)
+NORMALS = np.array(
+    [
+        (-1.0, 0.0, 0.0),
+        (1.0, 0.0, 0.0),
+        (0.0, -1.0, 0.0),
+        (0.0, 1.0, 0.0),
+        (0.0, 0.0, -1.0),
+        (0.0, 0.0, 1.0),
+    ]
+)
+
+#: Lowercase event names indexed by `Event.value`
+EVENT_NAMES = np.array([e.name.lower() for e in sorted(Event, key=lambda e: e.value)])
+
+
+def fresnel_reflectivity(cos_angle, n1, n2):
+    """ Vectorised version of `pvtrace.material.utils.fresnel_reflectivity` where
+        the angle of incidence is given by its cosine.
+    """
+    c = cos_angle
+    s = np.sqrt(np.maximum(0.0, 1.0 - c * c))
+    ratio = n1 / n2
+    k2 = 1.0 - (ratio * s) ** 2
+    tir = k2 < 0.0  # Catch TIR case
+    k = np.sqrt(np.maximum(0.0, k2))
+    Rs = ((n1 * c - n2 * k) / (n1 * c + n2 * k)) ** 2
+    Rp = ((n1 * k - n2 * c) / (n1 * k + n2 * c)) ** 2
+    return np.where(tir, 1.0, 0.5 * (Rs + Rp))
+
+
+def fresnel_refraction(direction, normal, n1, n2):
+    """ Vectorised version of `pvtrace.material.utils.fresnel_refraction` for a
+        normal which has been orientated along the direction of travel.
+    """
+    n = (n1 / n2)[:, None]
+    dot = np.sum(direction * normal, axis=1)[:, None]
+    c = np.sqrt(np.maximum(0.0, 1 - n ** 2 * (1 - dot ** 2)))
+    return n * direction + (c - n * dot) * normal
+
+
+def _phase_function(component, num):
+    """ Returns `num` direction vectors sampled from the component's phase function.
+    """
+    if accepts_size(component.phase_function):
+        return component.phase_function(size=num)
+    return np.array([component.phase_function() for _ in range(num)]).reshape(num, 3)
+
+
+def follow_box(
+    position,
+    direction,
+    wavelength,
+    source,
+    size,
+    world_size,
+    components,
+    n0=1.0,
+    n1=1.5,
+    facet_reflectivity=None,
+    facet_index_matched=None,
+    maxsteps=1000,
+    emit_method="kT",
+):
+    """ Trace a batch of rays through a box (refractive index `n1`, containing
+        `components`) embedded in a world box (refractive index `n0`).
+
+        Parameters
+        ----------
+        position: numpy.ndarray
+            Initial ray positions with shape (N, 3) in the box's coordinate system.
+        direction: numpy.ndarray
+            Initial ray direction unit vectors with shape (N, 3).
+        wavelength: numpy.ndarray
+            Initial ray wavelengths in nanometers with shape (N,).
+        source: numpy.ndarray
+            Name of the light source of each ray with shape (N,).
+        size: tuple of float
+            The side lengths of the box like (length, width, height).
+        world_size: tuple of float
+            The side lengths of the world box.
+        components: list of Component
+            The components of the box's material.
+        n0: float
+            Refractive index of the world material.
+        n1: float
+            Refractive index of the box material.
+        facet_reflectivity: numpy.ndarray (optional)
+            Reflectivity of each facet in the order of `NORMALS`. Use `nan` for
+            facets with Fresnel reflection.
+        facet_index_matched: numpy.ndarray of bool (optional)
+            Facets in the order of `NORMALS` which transmit rays without refraction.
+        maxsteps: int
+            Kill rays after this number of steps. Default is 1000.
+        emit_method: str
+            Either `'kT'`, `'redshift'` or `'full'`, see `photon_tracer.follow`.
+
+        Returns
+        -------
+        entrance, exit: tuple of dict
+            Ray attributes in the same form as `dataclasses.asdict(ray)` but where
+            each value is an array with a row per ray, and an `event` key with the
+            `Event.value` codes as int8 (see `EVENT_NAMES`). The `entrance` dict
+            contains the rays after their first event. The `exit` dict contains
+            rays which are absorbed or killed (at the final event) and rays which
+            exit the scene (at the penultimate event), this replicates the
+            information stored by `LSC.simulate`.
+    """
+    half = 0.5 * np.asarray(size, dtype=float)
+    world_half = 0.5 * np.asarray(world_size, dtype=float)
+    facet_reflectivity = (
+        np.full(6, np.nan)
+        if facet_reflectivity is None
+        else np.asarray(facet_reflectivity, dtype=float)
+    )
+    facet_index_matched = (
+        np.zeros(6, dtype=bool)
+        if facet_index_matched is None
+        else np.asarray(facet_index_matched, dtype=bool)
+    )
+
+    # Current ray state
+    pos = np.array(position, dtype=float).reshape(-1, 3)
+    vec = np.array(direction, dtype=float).reshape(-1, 3)
+    num = pos.shape[0]
+    nm = np.array(wavelength, dtype=float).reshape(num)
+    travelled = np.zeros(num)
+    src = np.array(source, dtype=object).reshape(num)
+    event = np.full(num, Event.GENERATE.value, dtype=np.int8)
+    inside = np.all(np.abs(pos) < half, axis=1)
+    alive = np.ones(num, dtype=bool)
+    steps = 0
+
+    # State before the most recent event
+    state = (pos, vec, nm, travelled, src, event)
+    previous = tuple(np.copy(x) for x in state)
+    entrance = None
+    final = tuple(np.copy(x) for x in state)
+    stored = np.zeros(num, dtype=bool)  # rays which should be in the exit store
+
+    def store(where, values):
+        for dst, src_ in zip(final, values):
+            dst[where] = src_[where]
+        stored[where] = True
+
+    while np.any(alive):
+        steps += 1
+        if steps > maxsteps:
+            event[alive] = Event.KILL.value
+            store(alive, state)
+            break
+
+        idx = np.flatnonzero(alive)
+        for dst, src_ in zip(previous, state):
+            dst[idx] = src_[idx]
+
+        p, d = pos[idx], vec[idx]
+        tnear, near_face, tfar, far_face = slab_intersections(half, p, d)
+        ins = inside[idx]
+
+        # Rays in the world which miss the box exit the scene.
+        hits = ins | ((tnear > EPS_ZERO) & (tnear <= tfar))
+        miss = idx[~hits]
+        if miss.size > 0:
+            _, _, texit, _ = slab_intersections(world_half, pos[miss], vec[miss])
+            pos[miss] += texit[:, None] * vec[miss]
+            travelled[miss] += texit
+            event[miss] = Event.EXIT.value
+            alive[miss] = False
+
+        distance = np.where(ins, tfar, tnear)
+        face = np.where(ins, far_face, near_face)
+
+        # Volume events for rays inside the box
+        absorbed = np.zeros(idx.size, dtype=bool)
+        if np.any(ins) and len(components) > 0:
+            i = idx[ins]
+            coefs = np.array([c.coefficient(nm[i]) for c in components]).reshape(
+                len(components), i.size
+            )
+            alpha = np.sum(coefs, axis=0)
+            with np.errstate(divide="ignore"):
+                depth = np.where(
+                    np.isclose(alpha, 0.0),
+                    np.inf,
+                    -np.log(1 - np.random.uniform(size=i.size)) / alpha,
+                )
+            depth = np.where(np.isfinite(alpha), depth, 0.0)
+            hit = depth < distance[ins]
+            absorbed[np.flatnonzero(ins)[hit]] = True
+            i, depth, coefs = i[hit], depth[hit], coefs[:, hit]
+            pos[i] += depth[:, None] * vec[i]
+            travelled[i] += depth
+
+            # Monte-Carlo sampling to find which component captures the ray
+            cdf = np.cumsum(coefs, axis=0)
+            gamma = np.random.uniform(size=i.size) * cdf[-1]
+            which = np.minimum(np.sum(cdf < gamma, axis=0), len(components) - 1)
+            for k, component in enumerate(components):
+                j = i[which == k]
+                if j.size == 0:
+                    continue
+                if isinstance(component, Absorber):
+                    radiative = np.zeros(j.size, dtype=bool)
+                else:
+                    radiative = np.random.uniform(size=j.size) < component.quantum_yield
+                lost = j[~radiative]
+                event[lost] = (
+                    Event.REACT.value
+                    if isinstance(component, Reactor)
+                    else Event.ABSORB.value
+                )
+                alive[lost] = False
+                j = j[radiative]
+                if j.size == 0:
+                    continue
+                vec[j] = _phase_function(component, j.size)
+                src[j] = component.name
+                if isinstance(component, Luminophore):
+                    nm[j] = component.sample_wavelength(nm[j], method=emit_method)
+                    event[j] = Event.EMIT.value
+                else:
+                    event[j] = Event.SCATTER.value
+
+        # Surface events for the remaining rays
+        at_surface = hits & ~absorbed
+        i = idx[at_surface]
+        t, f = distance[at_surface], face[at_surface]
+        pos[i] += t[:, None] * vec[i]
+        travelled[i] += t
+        ins = inside[i]
+        n_from = np.where(ins, n1, n0)
+        n_to = np.where(ins, n0, n1)
+        normal = NORMALS[f]
+        dot = np.sum(normal * vec[i], axis=1)
+        # Be tolerant with definition of surface normal
+        normal = np.where(dot[:, None] < 0.0, -normal, normal)
+        cos_angle = np.abs(dot)
+        r = facet_reflectivity[f]
+        r = np.where(np.isnan(r), fresnel_reflectivity(cos_angle, n_from, n_to), r)
+        reflected = np.zeros(i.size, dtype=bool)
+        maybe = r != 0.0
+        reflected[maybe] = np.random.uniform(size=np.count_nonzero(maybe)) < r[maybe]
+
+        j = i[reflected]
+        vec[j] = vec[j] - 2 * cos_angle[reflected][:, None] * normal[reflected]
+        event[j] = Event.REFLECT.value
+
+        transmitted = ~reflected
+        j = i[transmitted]
+        matched = facet_index_matched[f[transmitted]]
+        refracted = fresnel_refraction(
+            vec[j],
+            normal[transmitted],
+            n_from[transmitted],
+            n_to[transmitted],
+        )
+        vec[j] = np.where(matched[:, None], vec[j], refracted)
+        inside[j] = ~inside[j]
+        event[j] = Event.TRANSMIT.value
+
+        # Record rays after their first event
+        if entrance is None:
+            entrance = tuple(np.copy(x) for x in state)
+
+        # Rays leaving the scene are stored at the penultimate event, absorbed rays
+        # at the final event.
+        ended = idx[~alive[idx]]
+        store(ended[event[ended] == Event.EXIT.value], previous)
+        store(ended[event[ended] == Event.ABSORB.value], state)
+
+    if entrance is None:
+        entrance = state
+
+    def as_dict(values, where):
+        p, d, w, t, s, e = (x[where] for x in values)
+        return {
+            "position": p,
+            "direction": d,
+            "wavelength": w,
+            "is_alive": np.ones(p.shape[0], dtype=bool),
+            "travelled": t,
+            "source": s,
+            "event": e,
+        }
+
+    return as_dict(entrance, slice(None)), as_dict(final, stored)
@@ -11,14 +11,25 @@ from pvtrace.data import lumogen_f_red_305, fluro_red
 from pvtrace.scene.renderer import MeshcatRenderer
 from pvtrace.material.surface import Surface, FresnelSurfaceDelegate
 from pvtrace.material.distribution import Distribution
-from pvtrace.algorithm import photon_tracer
-from dataclasses import asdict
+from pvtrace.algorithm import photon_tracer, batch_tracer
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 import pandas as pd
 import functools
 import time
 
 
+#: Names of the box facets in the order of `batch_tracer.NORMALS`
+FACETS = ("left", "right", "near", "far", "bottom", "top")
+
+
+def facet_index(normal):
+    """ Returns the index of the box facet with the surface normal in `FACETS`.
+    """
+    axis = int(np.argmax(np.abs(normal)))
+    return 2 * axis + int(normal[axis] > 0.0)
+
+
 class OptionalMirrorAndSolarCell(FresnelSurfaceDelegate):
     """ A delegate adds an ideal specular mirror to the bottom surface and 
         perfectly indexed matched and perfectly absorbing solar cells to the edges.
@@ -29,33 +40,17 @@ class OptionalMirrorAndSolarCell(FresnelSurfaceDelegate):
         self.lsc = lsc
 
     def reflectivity(self, surface, ray, geometry, container, adjacent):
-        normal = geometry.normal(ray.position)
-        cell_locations = self.lsc._solar_cell_surfaces
-        back_surface_mirror = self.lsc._back_surface_mirror_info
-        want_back_surface_mirror = back_surface_mirror["want_back_surface_mirror"]
-        if np.allclose((0, 0, -1), normal) and want_back_surface_mirror:
-            return 1.0  # perfect mirror
-        elif np.allclose((-1, 0, 0), normal) and "left" in cell_locations:  # left
-            return 0.0  # perfect absorption
-        elif np.allclose((1, 0, 0), normal) and "right" in cell_locations:  # right
-            return 0.0
-        elif np.allclose((0, -1, 0), normal) and "near" in cell_locations:  # near
-            return 0.0
-        elif np.allclose((0, 1, 0), normal) and "far" in cell_locations:  # far
-            return 0.0
+        normal = self.surface_normal(ray, geometry)
+        r = self.lsc._facet_reflectivity[facet_index(normal)]
+        if not np.isnan(r):
+            return float(r)  # perfect mirror or perfect absorption
         return super(OptionalMirrorAndSolarCell, self).reflectivity(
             surface, ray, geometry, container, adjacent
         )  # opt-out of handling custom reflection
 
     def transmitted_direction(self, surface, ray, geometry, container, adjacent):
-        cell_locations = self.lsc._solar_cell_surfaces
-        normal = geometry.normal(ray.position)
-        if (
-            (np.allclose((-1, 0, 0), normal) and "left" in cell_locations)
-            or (np.allclose((1, 0, 0), normal) and "right" in cell_locations)
-            or (np.allclose((0, -1, 0), normal) and "near" in cell_locations)
-            or (np.allclose((0, 1, 0), normal) and "far" in cell_locations)
-        ):
+        normal = self.surface_normal(ray, geometry)
+        if self.lsc._facet_index_matched[facet_index(normal)]:
             return ray.direction  #  solar cell is perfectly index matched
         return super(OptionalMirrorAndSolarCell, self).transmitted_direction(
             surface, ray, geometry, container, adjacent
@@ -77,8 +72,8 @@ class AirGapMirror(FresnelSurfaceDelegate):
                 surface, ray, geometry, container, adjacent
             )
         else:
-            normal = geometry.normal(ray.position)
-            if not np.allclose((0.0, 0.0, 1.0), normal):  # top surface
+            normal = self.surface_normal(ray, geometry)
+            if FACETS[facet_index(normal)] != "top":
                 raise NotImplementedError("Not yet generalised to other surfaces.")
             # Currently this return lambertian direction along +z axis and is not
             # generalised to other orientations. This is simple to do using a transform
@@ -86,6 +81,53 @@ class AirGapMirror(FresnelSurfaceDelegate):
             return tuple(lambertian().tolist())
 
 
+@functools.lru_cache(maxsize=16)
+def _lumogen_f_red_305_spectra(x_bytes, dtype):
+    """ Returns the Lumogen F Red 305 absorption and emission spectra on the
+        wavelength grid, given as bytes so that repeated grids are cached.
+    """
+    x = np.frombuffer(x_bytes, dtype=dtype)
+    return lumogen_f_red_305.absorption(x), lumogen_f_red_305.emission(x)
+
+
+def _empty_columns(n):
+    """ Returns preallocated ray columns in the format of `batch_tracer.follow_box`.
+    """
+    return {
+        "position": np.empty((n, 3)),
+        "direction": np.empty((n, 3)),
+        "wavelength": np.empty(n),
+        "is_alive": np.empty(n, dtype=bool),
+        "travelled": np.empty(n),
+        "source": np.empty(n, dtype=object),
+        "event": np.empty(n, dtype=np.int8),
+    }
+
+
+def _set_columns(columns, idx, ray, event):
+    """ Writes the ray and event into row `idx` of the ray columns.
+    """
+    columns["position"][idx] = ray.position
+    columns["direction"][idx] = ray.direction
+    columns["wavelength"][idx] = ray.wavelength
+    columns["is_alive"][idx] = ray.is_alive
+    columns["travelled"][idx] = ray.travelled
+    columns["source"][idx] = ray.source
+    columns["event"][idx] = event.value
+
+
+def _trace_worker(lsc, method, n, offset, seed, emit_method):
+    """ Traces rays in a worker process using the LSC `method`, either
+        `'_trace_batch'` or `'_trace_histories'`.
+
+        The global random state is initialised from the worker's
+        `numpy.random.SeedSequence`, so that the streams of the workers are
+        statistically independent.
+    """
+    np.random.set_state(np.random.MT19937(seed).state)
+    return getattr(lsc, method)(n, offset, emit_method)
+
+
 class LSC(object):
     """Abstraction of a luminescent solar concentrator.
     
@@ -95,7 +137,8 @@ class LSC(object):
     def __init__(self, size, wavelength_range=None, n0=1.0, n1=1.5):
         super(LSC, self).__init__()
         if wavelength_range is None:
-            self.wavelength_range = np.arange(400, 800)
+            wavelength_range = np.arange(400, 800)
+        self.wavelength_range = np.asarray(wavelength_range)
 
         self.size = size  # centimetres
         self.n0 = n0
@@ -103,22 +146,36 @@ class LSC(object):
 
         self._solar_cell_surfaces = set()
         self._back_surface_mirror_info = {"want_back_surface_mirror": False}
+        self._update_facet_tables()
         self._air_gap_mirror_info = {"want_air_gap_mirror": False, "lambertian": False}
         self._scene = None
         self._renderer = None
         self._store = None
         self._df = None
         self._counts = None
+        # Names of the sources rays in the store can have, used to filter the results
+        self._result_component_names = frozenset()
+        self._result_light_names = frozenset()
+        self._result_source_names = frozenset()
         self._user_lights = []
         self._user_components = []
 
+    def __getstate__(self):
+        # Used when tracing in other processes. The renderer holds a connection to
+        # the visualiser and the results can be large, neither are needed there.
+        # The scene is rebuilt from the configuration because the geometry caches
+        # used for intersections do not survive pickling.
+        state = self.__dict__.copy()
+        state.update(_renderer=None, _scene=None, _store=None, _df=None, _counts=None)
+        return state
+
     def _make_default_components(self):
         """ Default LSC contains Lumogen F Red 305. With concentration such that
             the absorption coefficient at peak is 10 cm-1.
         """
         x = self.wavelength_range
-        coefficient = lumogen_f_red_305.absorption(x) * 10.0  # cm-1
-        emission = lumogen_f_red_305.emission(x)
+        absorption, emission = _lumogen_f_red_305_spectra(x.tobytes(), x.dtype.str)
+        coefficient = absorption * 10.0  # cm-1
         coefficient = np.column_stack((x, coefficient))
         emission = np.column_stack((x, emission))
         lumogen = {
@@ -157,11 +214,13 @@ class LSC(object):
             ),
         )
 
-        # Create components (Absorbers, Luminophores and Scatteres)
+        # Create components (Absorbers, Luminophores and Scatteres). The defaults are
+        # kept so that components added after this scene are traced alongside them.
         if len(self._user_components) == 0:
             self._user_components = self._make_default_components()
         components = []
         for component_data in self._user_components:
+            component_data = dict(component_data)
             cls = component_data.pop("cls")
             coefficient = component_data.pop("coefficient")
             component = cls(coefficient, **component_data)
@@ -216,21 +275,34 @@ class LSC(object):
             if light_data["rotation"]:
                 light_node.rotate(*light_data["rotation"])
 
-        self._scene = Scene(world)
+        return Scene(world)
 
-    def component_names(self):
+    def _get_scene(self):
+        """ Returns the scene, which is only created when first needed or after
+            nodes have been added.
+        """
         if self._scene is None:
+            self._scene = self._make_scene()
+        return self._scene
+
+    def component_names(self):
+        if self._store is None:
             raise ValueError("Run a simulation before calling this method.")
-        return {c["name"] for c in self._user_components}
+        return set(self._result_component_names)
 
     def light_names(self):
-        if self._scene is None:
+        if self._store is None:
             raise ValueError("Run a simulation before calling this method.")
-        return {l["name"] for l in self._user_lights}
+        return set(self._result_light_names)
 
     def add_luminophore(
         self, name, coefficient, emission, quantum_yield, phase_function=None
     ):
+        """ Adds a luminophore to the LSC. Components added before the first
+            simulation replace the default Lumogen F Red 305 and background
+            absorber; those added afterwards are traced alongside the components
+            already used.
+        """
         self._user_components.append(
             {
                 "cls": Luminophore,
@@ -241,13 +313,25 @@ class LSC(object):
                 "phase_function": phase_function,
             }
         )
+        self._scene = None
 
     def add_absorber(self, name, coefficient):
+        """ Adds an absorber to the LSC. Components added before the first
+            simulation replace the default Lumogen F Red 305 and background
+            absorber; those added afterwards are traced alongside the components
+            already used.
+        """
         self._user_components.append(
             {"cls": Absorber, "name": name, "coefficient": coefficient}
         )
+        self._scene = None
 
     def add_scatterer(self, name, coefficient, phase_function=None):
+        """ Adds a scatterer to the LSC. Components added before the first
+            simulation replace the default Lumogen F Red 305 and background
+            absorber; those added afterwards are traced alongside the components
+            already used.
+        """
         self._user_components.append(
             {
                 "cls": Scatterer,
@@ -256,6 +340,7 @@ class LSC(object):
                 "phase_function": phase_function,
             }
         )
+        self._scene = None
 
     def add_light(
         self,
@@ -266,6 +351,10 @@ class LSC(object):
         wavelength=None,  # wavelength delegate callable
         position=None,  # position delegate callable
     ):
+        """ Adds a light to the LSC. Lights added before the first simulation
+            replace the default spotlight; those added afterwards emit alongside
+            the lights already used.
+        """
         self._user_lights.append(
             {
                 "name": name,
@@ -276,6 +365,7 @@ class LSC(object):
                 "position": position,
             }
         )
+        self._scene = None
 
     def add_solar_cell(self, facets):
         if not isinstance(facets, (list, tuple, set)):
@@ -285,16 +375,35 @@ class LSC(object):
         if not facets.issubset(allowed):
             raise ValueError("Solar cell have allowed surfaces", allowed)
 
+        # The surface delegates read the facet tables when tracing, so the scene
+        # does not need to be rebuilt.
         self._solar_cell_surfaces = facets.union(self._solar_cell_surfaces)
+        self._update_facet_tables()
 
     def add_back_surface_mirror(self):
         self._back_surface_mirror_info = {"want_back_surface_mirror": True}
+        self._update_facet_tables()
+
+    def _update_facet_tables(self):
+        """ Tabulates the reflectivity (`nan` for Fresnel reflection) and whether
+            rays are transmitted without refraction for each facet in `FACETS`.
+        """
+        cells = self._solar_cell_surfaces
+        want_mirror = self._back_surface_mirror_info["want_back_surface_mirror"]
+        index_matched = np.array([facet in cells for facet in FACETS])
+        reflectivity = np.full(len(FACETS), np.nan)
+        reflectivity[index_matched] = 0.0  # perfect absorption
+        if want_mirror:
+            reflectivity[FACETS.index("bottom")] = 1.0  # perfect mirror
+        self._facet_reflectivity = reflectivity
+        self._facet_index_matched = index_matched
 
     def add_air_gap_mirror(self, lambertian=False):
         self._air_gap_mirror_info = {
             "want_air_gap_mirror": True,
             "lambertian": lambertian,
         }
+        self._scene = None
 
     # Simulate
 
@@ -321,9 +430,7 @@ class LSC(object):
             "short_length": short_length,
         }
 
-        if self._scene is None:
-            self._make_scene()
-
+        scene = self._get_scene()
         self._renderer = MeshcatRenderer(
             open_browser=open_browser,
             transparency=False,
@@ -331,32 +438,140 @@ class LSC(object):
             wireframe=wireframe,
             max_histories=50,
         )
-        self._renderer.render(self._scene)
+        self._renderer.render(scene)
         time.sleep(1.0)
         return self._renderer
 
-    def simulate(self, n, progress=None, emit_method="kT"):
-        if self._scene is None:
-            self._make_scene()
-        scene = self._scene
+    def simulate(self, n, progress=None, emit_method="kT", workers=1):
+        """ Simulate `n` rays and append the results to the store.
 
-        # Simulate can be called multiple time to append rays to the store
-        if self._store is None:
-            store = {"entrance_rays": [], "exit_rays": []}
+            Rays which need a full path history are traced one at a time with
+            `photon_tracer.follow`; these are the rays drawn in the visualiser (at
+            most `max_histories` of them) and, when an air gap mirror has been
+            added, every ray, because only the per-ray tracer supports it. All
+            other rays are traced with the much faster batched tracer, see
+            `simulate_batched`.
+
+            With a visualiser only the first `max_histories` rays of the run are
+            drawn, the rest are traced but not shown. The picture is therefore not
+            a sample of the whole run; use `spectrum` and `summary` for the
+            results of every ray.
+
+            Parameters
+            ----------
+            n: int
+                The number of rays to trace.
+            progress: callable (optional)
+                Called with the number of rays traced so far. Drawn rays report
+                after every ray, other rays report as each worker or batch
+                finishes.
+            emit_method: str
+                Either `'kT'`, `'redshift'` or `'full'`, see `photon_tracer.follow`.
+            workers: int
+                The number of processes used to trace the rays which are not
+                drawn. When larger than one the rays are traced in a
+                `concurrent.futures.ProcessPoolExecutor` and the LSC, including
+                any light and component delegates, must be picklable (e.g. use
+                `functools.partial` rather than `lambda`).
+        """
+        vis = self._renderer
+        if self._air_gap_mirror_info["want_air_gap_mirror"]:
+            # Only the per-ray tracer supports air gap mirrors
+            num_histories = n
+        elif vis:
+            # Full ray histories are only needed to draw rays in the visualiser
+            num_histories = min(n, vis.max_histories)
+        else:
+            num_histories = 0
+        # The visualiser only keeps the most recent `max_histories` objects, so only
+        # that many rays are drawn and traced in this process.
+        num_drawn = min(num_histories, vis.max_histories) if vis else 0
+
+        self._get_scene()
+        results = []
+        if num_drawn > 0:
+            results.append(self._trace_histories(num_drawn, 0, emit_method, progress))
+        if num_drawn < num_histories:
+            results.extend(
+                self._trace_in_workers(
+                    "_trace_histories",
+                    num_histories - num_drawn,
+                    num_drawn,
+                    emit_method,
+                    workers,
+                    progress=progress,
+                )
+            )
+        if num_histories < n:
+            results.extend(
+                self._trace_in_workers(
+                    "_trace_batch",
+                    n - num_histories,
+                    num_histories,
+                    emit_method,
+                    workers,
+                    progress=progress,
+                )
+            )
+
+        print("Tracing finished.")
+        self._add_results(results)
 
+    def simulate_batched(self, n, emit_method="kT", workers=1):
+        """ Simulate `n` rays using the batched tracer.
+
+            The batched tracer advances all rays together using numpy arrays and is
+            much faster than `simulate` for large numbers of rays. The rays are not
+            rendered in the visualiser. Air gap mirrors are not supported.
+
+            Parameters
+            ----------
+            n: int
+                The number of rays to trace.
+            emit_method: str
+                Either `'kT'`, `'redshift'` or `'full'`, see `photon_tracer.follow`.
+            workers: int
+                The number of processes used to trace the rays. When larger than one
+                the LSC, including any light and component delegates, must be
+                picklable (e.g. use `functools.partial` rather than `lambda`).
+        """
+        if self._air_gap_mirror_info["want_air_gap_mirror"]:
+            raise NotImplementedError(
+                "The batched tracer does not support air gap mirrors, use `simulate`."
+            )
+        self._get_scene()
+        results = self._trace_in_workers("_trace_batch", n, 0, emit_method, workers)
+        print("Tracing finished.")
+        self._add_results(results)
+
+    def _trace_histories(self, n, offset, emit_method, progress=None):
+        """ Trace `n` rays with `photon_tracer.follow`, drawing them in the
+            visualiser if there is one, and return the entrance and exit ray
+            columns. The `offset` is the index of the first ray, which is used to
+            cycle through the light sources.
+        """
+        scene = self._get_scene()
+
+        # Ray columns are preallocated and filled in place, the exit rows are
+        # trimmed afterwards because not every ray has an exit record.
+        entrance = _empty_columns(n)
+        exit = _empty_columns(n)
+        num_exit = 0
         vis = self._renderer
         count = 0
-        for ray in scene.emit(n):
+        for idx, ray in enumerate(scene.emit(n, offset=offset)):
             history = photon_tracer.follow(scene, ray, emit_method=emit_method)
-            rays, events = zip(*history)
-            store["entrance_rays"].append((rays[1], events[1]))
-            if events[-1] in (Event.ABSORB, Event.KILL):
+            _set_columns(entrance, idx, *history[1])
+            final_event = history[-1][1]
+            if final_event in (Event.ABSORB, Event.KILL):
                 # final event is a lost store path information at final event
-                store["exit_rays"].append((rays[-1], events[-1]))
-            elif events[-1] == Event.EXIT:
+                _set_columns(exit, num_exit, *history[-1])
+                num_exit += 1
+            elif final_event == Event.EXIT:
                 # final event hits the world node. Store path information at
                 # penultimate location
-                store["exit_rays"].append((rays[-2], events[-2]))
+                _set_columns(exit, num_exit, *history[-2])
+                num_exit += 1
 
             # Update visualiser
             if vis:
@@ -367,35 +582,128 @@ class LSC(object):
                 count += 1
                 progress(count)
 
-        self._store = store
-        print("Tracing finished.")
-        print("Preparing results.")
-        df = self._make_dataframe()
-        df = self.expand_coords(df, "direction")
-        df = self.expand_coords(df, "position")
-        df = self.label_facets(df, *self.size)
-        self._df = df
+        exit = {key: value[:num_exit] for key, value in exit.items()}
+        return entrance, exit
 
-    def _make_dataframe(self):
+    def _trace_in_workers(self, method, n, offset, emit_method, workers, progress=None):
+        """ Trace `n` rays with the LSC `method`, either `'_trace_batch'` or
+            `'_trace_histories'`, split over `workers` processes. Returns a list of
+            the entrance and exit ray columns of each part.
 
-        # to-do: Only need to process additional rays not whole dataframe! Optimise!
-        df = pd.DataFrame()
+            The rays before `offset` are assumed to have been traced already, so
+            `progress` is called with the running count `offset + traced` as each
+            part finishes (or after every ray for `'_trace_histories'` in this
+            process).
+        """
+        if workers > 1:
+            indices = np.arange(offset, offset + n)
+            chunks = [c for c in np.array_split(indices, workers) if c.size > 0]
+            # Seeded from the global state so that np.random.seed reproduces runs
+            entropy = np.random.randint(2 ** 31)
+            seeds = np.random.SeedSequence(entropy).spawn(len(chunks))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(
+                        _trace_worker, self, method, c.size, c[0], seed, emit_method
+                    ): c.size
+                    for c, seed in zip(chunks, seeds)
+                }
+                count = offset
+                for future in as_completed(futures):
+                    count += futures[future]
+                    if progress:
+                        progress(count)
+                return [future.result() for future in futures]
+
+        if method == "_trace_histories" and progress:
+            # Report every ray as if they were traced in the same loop
+            def report(count):
+                progress(offset + count)
+
+            return [self._trace_histories(n, offset, emit_method, report)]
+        result = getattr(self, method)(n, offset, emit_method)
+        if progress:
+            progress(offset + n)
+        return [result]
+
+    def _add_results(self, results):
+        """ Appends the entrance and exit ray columns of traced batches to the
+            store. The dataframe is rebuilt when the results are next needed.
+        """
+        if self._store is None:
+            self._store = []
+        self._store.extend(results)
+        # Nodes can be added between simulations, so keep the names of every scene
+        # which has contributed results.
+        scene = self._get_scene()
+        self._result_component_names |= {c.name for c in scene.component_nodes}
+        self._result_light_names |= {l.name for l in scene.light_nodes}
+        self._result_source_names = (
+            self._result_component_names | self._result_light_names
+        )
+        self._df = None
+        self._counts = None
 
-        # Rays entering the scene
-        for ray, event in self._store["entrance_rays"]:
-            rep = asdict(ray)
-            rep["kind"] = "entrance"
-            rep["event"] = event.name.lower()
-            df = df.append(rep, ignore_index=True)
+    def _get_df(self):
+        """ Returns the results dataframe, or None if nothing has been simulated.
+        """
+        if self._df is None and self._store is not None:
+            print("Preparing results.")
+            df = self._make_dataframe()
+            df = self.label_facets(df, *self.size)
+            self._df = df
+        return self._df
+
+    def _trace_batch(self, n, offset, emit_method):
+        """ Emit and trace `n` rays with the batched tracer and return the entrance
+            and exit ray columns. The `offset` is the index of the first ray, which
+            is used to cycle through the light sources.
+        """
+        scene = self._get_scene()
+        world = scene.root
+        lsc = next(node for node in world.children if node.name == "LSC")
 
-        # Rays exiting the scene
-        for ray, event in self._store["exit_rays"]:
-            rep = asdict(ray)
-            rep["kind"] = "exit"
-            rep["event"] = event.name.lower()
-            df = df.append(rep, ignore_index=True)
+        wavelength, position, direction, source = scene.emit_batch(
+            n, offset=offset, node=lsc
+        )
+        return batch_tracer.follow_box(
+            position,
+            direction,
+            wavelength,
+            source,
+            lsc.geometry._size,
+            world.geometry._size,
+            lsc.geometry.material.components,
+            n0=self.n0,
+            n1=self.n1,
+            facet_reflectivity=self._facet_reflectivity,
+            facet_index_matched=self._facet_index_matched,
+            emit_method=emit_method,
+        )
 
-        self._df = df
+    def _make_dataframe(self):
+        kinds = ["entrance", "exit"]
+        frames = []
+        for code, kind in enumerate(kinds):
+            for entrance, exit in self._store:
+                columns = entrance if kind == "entrance" else exit
+                data = {
+                    key: columns[key]
+                    for key in ("wavelength", "is_alive", "travelled", "source")
+                }
+                data["kind"] = pd.Categorical.from_codes(
+                    np.full(len(columns["wavelength"]), code, dtype=np.int8),
+                    categories=kinds,
+                )
+                data["event"] = pd.Categorical.from_codes(
+                    columns["event"], categories=batch_tracer.EVENT_NAMES
+                )
+                for column in ("direction", "position"):
+                    for axis, label in enumerate("xyz"):
+                        data["{}_{}".format(column, label)] = columns[column][:, axis]
+                frames.append(pd.DataFrame(data))
+        df = pd.concat(frames, ignore_index=True)
+        df["source"] = df["source"].astype("category")
         return df
 
     def expand_coords(self, df, column):
@@ -422,13 +730,14 @@ class LSC(object):
             the function will return a new dataframe::
         
                 edf = expand_coords(df, 'position')
-                edf == pd.DataFrame({'position_x': [1], 'position_y': [2], 'position_z': [3]})
+                edf == pd.DataFrame(
+                    {'position_x': [1], 'position_y': [2], 'position_z': [3]}
+                )
         
         """
-        coords = np.stack(df[column].values)
-        df["{}_x".format(column)] = coords[:, 0]
-        df["{}_y".format(column)] = coords[:, 1]
-        df["{}_z".format(column)] = coords[:, 2]
+        coords = np.array(df[column].tolist()).reshape(-1, 3)
+        labels = ["{}_{}".format(column, axis) for axis in "xyz"]
+        df[labels] = coords
         df.drop(columns=column, inplace=True)
         return df
 
@@ -445,12 +754,22 @@ class LSC(object):
         xmin, xmax = -0.5 * length, 0.5 * length
         ymin, ymax = -0.5 * width, 0.5 * width
         zmin, zmax = -0.5 * height, 0.5 * height
-        df.loc[(np.isclose(df["position_x"], xmin, atol=EPS_ZERO)), "facet"] = "left"
-        df.loc[(np.isclose(df["position_x"], xmax, atol=EPS_ZERO)), "facet"] = "right"
-        df.loc[(np.isclose(df["position_y"], ymin, atol=EPS_ZERO)), "facet"] = "far"
-        df.loc[(np.isclose(df["position_y"], ymax, atol=EPS_ZERO)), "facet"] = "near"
-        df.loc[(np.isclose(df["position_z"], zmin, atol=EPS_ZERO)), "facet"] = "bottom"
-        df.loc[(np.isclose(df["position_z"], zmax, atol=EPS_ZERO)), "facet"] = "top"
+        x = df["position_x"].to_numpy()
+        y = df["position_y"].to_numpy()
+        z = df["position_z"].to_numpy()
+        # Points on an edge or corner belong to more than one facet. The first
+        # matching condition wins, so the z facets take precedence over y and x.
+        conditions = [
+            np.isclose(z, zmax, atol=EPS_ZERO),
+            np.isclose(z, zmin, atol=EPS_ZERO),
+            np.isclose(y, ymax, atol=EPS_ZERO),
+            np.isclose(y, ymin, atol=EPS_ZERO),
+            np.isclose(x, xmax, atol=EPS_ZERO),
+            np.isclose(x, xmin, atol=EPS_ZERO),
+        ]
+        labels = ["top", "bottom", "near", "far", "right", "left"]
+        facet = np.select(conditions, labels, default=None)
+        df["facet"] = pd.Categorical(facet, categories=labels)
         return df
 
     def _make_counts(self, df):
@@ -458,38 +777,36 @@ class LSC(object):
         if self._counts is not None:
             return self._counts
 
-        components = self._scene.component_nodes
-        lights = self._scene.light_nodes
-        all_components = {component.name for component in components}
-        all_lights = {light.name for light in lights}
+        if df is None:
+            raise ValueError("Run a simulation before calling this method.")
+
+        all_components = self._result_component_names
+        all_lights = self._result_light_names
+
+        # Tally the rays in a single pass and then reduce over the sources of interest
+        # rather than filtering the full dataframe once per facet.
+        tally = df.groupby(["kind", "facet", "source"], observed=True).size()
+        sources = tally.index.get_level_values("source")
+        solar = tally[sources.isin(all_lights)].groupby(level=["kind", "facet"]).sum()
+        lum = tally[sources.isin(all_components)].groupby(level=["kind", "facet"]).sum()
+
+        def count(counts, kind):
+            return {
+                facet: int(counts.get((kind, facet), 0))
+                for facet in {"left", "right", "near", "far", "top", "bottom"}
+            }
 
         # Count solar photons exiting
-        solar_out = dict()
-        for facet in {"left", "right", "near", "far", "top", "bottom"}:
-            solar_out[facet] = self.spectrum(
-                facets={facet}, source=all_lights, kind="last"
-            ).shape[0]
+        solar_out = count(solar, "exit")
 
         # Count solar photons entering
-        solar_in = dict()
-        for facet in {"left", "right", "near", "far", "top", "bottom"}:
-            solar_in[facet] = self.spectrum(
-                facets={facet}, source=all_lights, kind="first"
-            ).shape[0]
+        solar_in = count(solar, "entrance")
 
         # Count luminescent photons exiting
-        lum_out = dict()
-        for facet in {"left", "right", "near", "far", "top", "bottom"}:
-            lum_out[facet] = self.spectrum(
-                facets={facet}, source=all_components, kind="last"
-            ).shape[0]
+        lum_out = count(lum, "exit")
 
         # Count luminescent photons entering
-        lum_in = dict()
-        for facet in {"left", "right", "near", "far", "top", "bottom"}:
-            lum_in[facet] = self.spectrum(
-                facets={facet}, source=all_components, kind="first"
-            ).shape[0]
+        lum_in = count(lum, "entrance")
 
         self._counts = counts = pd.DataFrame(
             {
@@ -503,27 +820,23 @@ class LSC(object):
         return counts
 
     def spectrum(self, facets=set(), kind="last", source="all", events=None):
-        if self._df is None:
+        df = self._get_df()
+        if df is None:
             raise ValueError("Run a simulation before calling this method.")
 
-        df = self._df
-
         if kind is not None:
             if not kind in {"first", "last"}:
                 raise ValueError("Direction must be either `'first'` or `'last'.`")
 
-        if kind is None:
-            want_kind = True  # Opt-out
-        else:
-            if kind == "first":
-                want_kind = df["kind"] == "entrance"
-            else:
-                want_kind = df["kind"] == "exit"
+        # Row filters are combined as a single boolean array and only the wavelength
+        # column is selected, rather than copying every column of the rows.
+        want = np.ones(len(df), dtype=bool)
+        if kind is not None:
+            wanted_kind = "entrance" if kind == "first" else "exit"
+            want &= (df["kind"] == wanted_kind).to_numpy()
 
-        all_sources = self.component_names() | self.light_names()
-        if source == "all":
-            want_sources = all_sources
-        else:
+        all_sources = self._result_source_names
+        if source != "all":
             if isinstance(source, str):
                 source = {source}
             if not set(source).issubset(all_sources):
@@ -531,28 +844,24 @@ class LSC(object):
                 raise ValueError("Unknown source requested.", unknown_source_set)
 
         if source == "all":
-            want_source = df["source"].isin(all_sources)
+            want &= df["source"].isin(all_sources).to_numpy()
         else:
-            want_source = df["source"].isin(set(source))
+            want &= df["source"].isin(set(source)).to_numpy()
 
         if isinstance(facets, (list, tuple, set)):
             if len(facets) > 0:
-                want_facets = df["facet"].isin(set(facets))
-            else:
-                want_facets = True  # don't filter by facets
+                want &= df["facet"].isin(set(facets)).to_numpy()
         else:
             raise ValueError(
                 "`'facets'` should be a set `{'left', 'right'}`", {"got": facets}
             )
 
-        if events is None:
-            want_events = True  # Don't filter by events
-        else:
+        if events is not None:
             all_events = {e.name.lower() for e in Event}
             if isinstance(events, (list, tuple, set)):
                 events = set(events)
                 if events.issubset(all_events):
-                    want_events = df["event"].isin(events)
+                    want &= df["event"].isin(events).to_numpy()
                 else:
                     raise ValueError(
                         "Contained some unknown events",
@@ -563,21 +872,14 @@ class LSC(object):
                     "Events must be set of event strings", {"allowed": all_events}
                 )
 
-        return df.loc[want_kind & want_source & want_facets & want_events]["wavelength"]
+        return df["wavelength"][want]
 
     def counts(self):
-        df = self._df
-        if df is None:
-            df = self._make_dataframe()
-            df = self.expand_coords(df, "direction")
-            df = self.expand_coords(df, "position")
-            df = self.label_facets(df, *self.size)
-
-        counts = self._make_counts(df)
+        counts = self._make_counts(self._get_df())
         return counts
 
     def summary(self):
-        counts = self._make_counts(self._df)
+        counts = self._make_counts(self._get_df())
         all_facets = {"left", "right", "near", "far", "top", "bottom"}
 
         lum_collected = 0
@@ -662,8 +964,11 @@ def test1():
         return g(x, a1, p1, w1) + g(x, a2, p2, w2)
 
     lamp_dist = Distribution(x, lamp_spectrum(x))
-    wavelength_callable = lambda: lamp_dist.sample(np.random.uniform())
-    position_callable = lambda: rectangular_mask(l / 2, w / 2)
+
+    def wavelength_callable(size=None):
+        return lamp_dist.sample(np.random.uniform(size=size))
+
+    position_callable = functools.partial(rectangular_mask, l / 2, w / 2)
     lsc.add_light(
         "Oriel Lamp + Filter",
         (0.0, 0.0, 0.5 * d + 0.01),  # put close to top surface
@@ -730,8 +1035,11 @@ def test2():
         return g(x, a1, p1, w1) + g(x, a2, p2, w2)
 
     lamp_dist = Distribution(x, lamp_spectrum(x))
-    wavelength_callable = lambda: lamp_dist.sample(np.random.uniform())
-    position_callable = lambda: rectangular_mask(l / 2, w / 2)
+
+    def wavelength_callable(size=None):
+        return lamp_dist.sample(np.random.uniform(size=size))
+
+    position_callable = functools.partial(rectangular_mask, l / 2, w / 2)
     lsc.add_light(
         "Oriel Lamp + Filter",
         (0.0, 0.0, 0.5 * d + 0.01),  # put close to top surface
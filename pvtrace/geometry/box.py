@@ -5,10 +5,13 @@ from pvtrace.geometry.utils import (
     allinrange,
     aabb_intersection,
     on_aabb_surface,
+    slab_intersections,
 )
 from pvtrace.common.errors import GeometryError
+from typing import Sequence
 import trimesh
 import numpy as np
+import math
 from collections import Counter
 import logging
 
@@ -43,6 +46,67 @@ class Box(Mesh):
         mesh = trimesh.creation.box(size)
         super(Box, self).__init__(mesh, material=material)
 
+    def intersections(self, position: tuple, direction: tuple) -> Sequence[tuple]:
+        """ Returns tuple of intersection points sorted by distance from origin.
+
+            Uses a slab test rather than casting the ray against the triangles of
+            the trimesh, which gives the same points but is much faster.
+        """
+        tnear, tfar = -math.inf, math.inf
+        for p, d, s in zip(position, direction, self._size.tolist()):
+            h = 0.5 * s
+            if d == 0.0:
+                if abs(p) > h:
+                    return tuple()  # parallel to and outside of this slab
+                continue
+            t1 = (-h - p) / d
+            t2 = (h - p) / d
+            if t1 > t2:
+                t1, t2 = t2, t1
+            if t1 > tnear:
+                tnear = t1
+            if t2 < tfar:
+                tfar = t2
+        if tnear > tfar:
+            return tuple()
+        return tuple(
+            tuple(p + t * d for p, d in zip(position, direction))
+            for t in (tnear, tfar)
+            if t >= 0.0
+        )
+
+    def intersections_batch(self, positions, directions):
+        """ Returns the distances to the intersections of many rays with the box.
+
+            Parameters
+            ----------
+            positions : numpy.ndarray
+                Ray positions with shape (N, 3).
+            directions : numpy.ndarray
+                Ray directions with shape (N, 3).
+
+            Returns
+            -------
+            distances : numpy.ndarray
+                Array with shape (N, 2) of the distances along each ray to the
+                near and far intersection points. Intersections behind the ray
+                position, and both columns for rays which miss, are `nan`.
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=float).reshape(-1, 3)
+        tnear, _, tfar, _ = slab_intersections(0.5 * self._size, positions, directions)
+        distances = np.column_stack((tnear, tfar))
+        distances[(distances < 0.0) | (tnear > tfar)[:, None]] = np.nan
+        return distances
+
+    def contains(self, point: tuple) -> bool:
+        """ Return True if the point is inside the box. Points on the surface are
+            not contained.
+        """
+        return all(
+            abs(p) < 0.5 * s - EPS_ZERO for p, s in zip(point, self._size.tolist())
+        )
+
     def is_on_surface(self, point):
         on_surf, _ = on_aabb_surface(self._size, point, atol=2 * EPS_ZERO)
         return on_surf
@@ -1,7 +1,12 @@
 from pvtrace.geometry.geometry import Geometry
 from pvtrace.common.errors import GeometryError
-from pvtrace.geometry.utils import angle_between, norm, close_to_zero, ray_z_cylinder
-import numpy as np
+from pvtrace.geometry.utils import (
+    angle_between,
+    ray_z_cylinder,
+    ray_z_cylinder_batch,
+    EPS_ZERO,
+)
+import math
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,52 +31,73 @@ class Cylinder(Geometry):
     def set_material(self, new_value):
         self._material = new_value
 
+    def _surface_normal(self, point):
+        """ Returns the outward surface normal at the point, or `None` if the point
+            is not on the surface. The end caps take precedence at the edges.
+        """
+        x, y, z = point
+        half_length = 0.5 * self.length
+        r = math.sqrt(x * x + y * y)
+        if r < self.radius + EPS_ZERO:
+            if abs(z + half_length) < EPS_ZERO:
+                return (0.0, 0.0, -1.0)
+            if abs(z - half_length) < EPS_ZERO:
+                return (0.0, 0.0, 1.0)
+        if abs(r - self.radius) < EPS_ZERO and abs(z) < half_length + EPS_ZERO:
+            return (x / r, y / r, 0.0)
+        return None
+
     def is_on_surface(self, point):
-        # Just use any direction for a fake ray, we only need the distance
-        _, dist = ray_z_cylinder(self.length, self.radius, point, norm((1, 1, 1)))
-        if len(dist) == 0:
-            return False
-        dist = dist[0]  # Only need closest intersection
-        if close_to_zero(dist):
-            # print("dist from point {} {} is_on_surface True".format(dist, point))
-            return True
-        # print("dist from point {} {} is_on_surface False".format(dist, point))
-        return False
+        return self._surface_normal(point) is not None
 
     def contains(self, point):
-        z = point[2]
-        r = np.sqrt(np.sum(np.array(point[:2]) ** 2))
-        if z > -0.5 * self.length and z < 0.5 * self.length and r < self.radius:
-            return True
-        return False
+        x, y, z = point
+        half_length = 0.5 * self.length
+        return (
+            -half_length < z < half_length
+            and x * x + y * y < self.radius * self.radius
+        )
 
     def intersections(self, origin, direction):
         points, _ = ray_z_cylinder(self.length, self.radius, origin, direction)
         return points
 
+    def intersections_batch(self, positions, directions):
+        """ Returns the distances to the intersections of many rays with the
+            cylinder.
+
+            Parameters
+            ----------
+            positions : numpy.ndarray
+                Ray positions with shape (N, 3).
+            directions : numpy.ndarray
+                Ray directions with shape (N, 3).
+
+            Returns
+            -------
+            distances : numpy.ndarray
+                Array with shape (N, 2) of the distances along each ray to the
+                near and far intersection points. Intersections behind the ray
+                position, and both columns for rays which miss, are `nan`.
+        """
+        return ray_z_cylinder_batch(self.length, self.radius, positions, directions)
+
     def normal(self, surface_point):
         """ Normal faces outwards by convention.
         """
-        z = surface_point[2]
-        if np.isclose(z, -0.5 * self.length):
-            return (0.0, 0.0, -1.0)
-        elif np.isclose(z, 0.5 * self.length):
-            return (0.0, 0.0, 1.0)
-        elif np.isclose(self.radius, np.sqrt(np.sum(np.array(surface_point[:2]) ** 2))):
-            v = np.array(surface_point) - np.array([0.0, 0.0, surface_point[2]])
-            n = tuple(norm(v).tolist())
-            return n
-        else:
+        normal = self._surface_normal(surface_point)
+        if normal is None:
             raise GeometryError("Not a surface point.")
+        return normal
 
     def is_entering(self, surface_point, direction) -> bool:
         """ Returns True if the ray at surface point with direction is heading 
         into the shape. This is tested by checking for a negative dot product between
         the vectors.
         """
-        if not self.is_on_surface(surface_point):
+        normal = self._surface_normal(surface_point)
+        if normal is None:
             raise GeometryError("Not a surface point.")
-        normal = self.normal(surface_point)
-        if np.dot(normal, direction) < 0.0:
-            return True
-        return False
+        nx, ny, nz = normal
+        dx, dy, dz = direction
+        return nx * dx + ny * dy + nz * dz < 0.0
@@ -1,7 +1,6 @@
 from dataclasses import dataclass, field
 from typing import Tuple
-import numpy as np
-from pvtrace.geometry.utils import distance_between, floats_close
+from pvtrace.geometry.utils import floats_close, isclose
 import logging
 
 logger = logging.getLogger(__name__)
@@ -33,11 +32,9 @@ class Intersection:
         )
 
     def __eq__(self, other):
-        return all(
-            [
-                self.coordsys == other.coordsys,
-                np.allclose(self.point, other.point),
-                self.hit == other.hit,
-                floats_close(self.distance, other.distance),
-            ]
+        return (
+            self.coordsys == other.coordsys
+            and self.hit == other.hit
+            and all(isclose(a, b) for a, b in zip(self.point, other.point))
+            and floats_close(self.distance, other.distance)
         )
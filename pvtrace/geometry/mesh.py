@@ -17,6 +17,8 @@ class Mesh(Geometry):
         trimesh.vertices -= trimesh.center_mass
         self.trimesh = trimesh
         self._material = material
+        self._last_nearest = None
+        self._bounds = trimesh.bounds.tolist()
 
     @property
     def material(self):
@@ -29,15 +31,32 @@ class Mesh(Geometry):
     def contains(self, point: tuple) -> bool:
         """ Return True if the point is inside the shape.
         """
+        # Cheap rejection of points outside of the bounding box before the much
+        # more expensive ray test of trimesh.
+        lower, upper = self._bounds
+        if not all(lo <= p <= hi for lo, p, hi in zip(lower, point, upper)):
+            return False
         return self.trimesh.contains(np.array([point]))[0]
 
+    def _nearest(self, point: tuple):
+        """ Returns the closest points, distances and triangle ids of the surface
+            to the point.
+
+            The last query is cached because `is_on_surface`, `normal` and
+            `is_entering` are usually called one after another with the same point.
+        """
+        point = tuple(point)
+        last = self._last_nearest
+        if last is not None and last[0] == point:
+            return last[1]
+        result = self.trimesh.nearest.on_surface(np.array([point]))
+        self._last_nearest = (point, result)
+        return result
+
     def is_on_surface(self, point: tuple) -> bool:
         """Returns `True` is the point is on the surface."""
         # This fails sometimes because surface points can be larger than EPS_ZERO
-        mesh = self.trimesh
-        closest_points, distances, triangle_id = mesh.nearest.on_surface(
-            np.array([point])
-        )
+        closest_points, distances, triangle_id = self._nearest(point)
         flag = np.any(np.absolute(distances) < EPS_ZERO)
         return flag
 
@@ -50,23 +69,14 @@ class Mesh(Geometry):
         )
         if len(locations) == 0:
             return tuple()
-        locations = [tuple(x) for x in locations.tolist()]
-
-        def distance_sort_key(i):
-            v = np.array(i) - np.array(position)
-            d = np.linalg.norm(v)
-            return d
-
-        locations = tuple(sorted(locations, key=distance_sort_key))
-        return locations
+        diff = locations - np.asarray(position)
+        order = np.argsort(np.einsum("ij,ij->i", diff, diff), kind="stable")
+        return tuple(tuple(x) for x in locations[order].tolist())
 
     def normal(self, surface_point: tuple) -> tuple:
         """ Returns the unit surface normal at the surface_point.
         """
-        mesh = self.trimesh
-        (closest_points, distances, triangle_id) = mesh.nearest.on_surface(
-            np.array([surface_point])
-        )
+        (closest_points, distances, triangle_id) = self._nearest(surface_point)
         if closest_points.shape != (1, 3):
             raise GeometryError(
                 "Mesh must have a single closest point to calculate normal."
@@ -81,13 +91,12 @@ class Mesh(Geometry):
                     "threshold": EPS_ZERO,
                 },
             )
-        normal = tuple(mesh.face_normals[triangle_id[0]])
+        normal = tuple(self.trimesh.face_normals[triangle_id[0]].tolist())
         return normal
 
     def is_entering(self, surface_point: tuple, direction: tuple) -> bool:
         """ Returns the unit surface normal at the surface_point.
         """
-        normal = self.normal(surface_point)
-        if np.dot(normal, direction) < 0.0:
-            return True
-        return False
+        nx, ny, nz = self.normal(surface_point)
+        dx, dy, dz = direction
+        return nx * dx + ny * dy + nz * dz < 0.0
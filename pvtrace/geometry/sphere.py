@@ -1,6 +1,7 @@
 from pvtrace.geometry.geometry import Geometry
-from pvtrace.geometry.utils import angle_between, EPS_ZERO
+from pvtrace.geometry.utils import angle_between, isclose, EPS_ZERO
 import numpy as np
+import math
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,53 +26,78 @@ class Sphere(Geometry):
         self._material = new_value
 
     def is_on_surface(self, point):
-        r = np.sqrt(np.sum(np.array(point) ** 2))
-        return np.abs(r - self.radius) < EPS_ZERO
+        x, y, z = point
+        r = math.sqrt(x * x + y * y + z * z)
+        return abs(r - self.radius) < EPS_ZERO
 
     def contains(self, point):
-        r = np.sqrt(np.sum(np.array(point) ** 2))
-        return self.radius - (r + EPS_ZERO) > 0.0
+        x, y, z = point
+        inner = self.radius - EPS_ZERO
+        return inner > 0.0 and x * x + y * y + z * z < inner * inner
 
     def intersections(self, origin, direction):
-        # Compute a, b and b coefficients
-        origin = np.array(origin)
-        direction = np.array(direction)
-        a = np.dot(direction, direction)
-        b = 2.0 * np.dot(direction, origin)
-        c = np.dot(origin, origin) - self.radius ** 2
+        # Compute a, b and c coefficients with plain floats, this is called for
+        # every ray step so avoid the overhead of numpy on 3-vectors.
+        ox, oy, oz = origin
+        dx, dy, dz = direction
+        a = dx * dx + dy * dy + dz * dz
+        b = 2.0 * (dx * ox + dy * oy + dz * oz)
+        c = ox * ox + oy * oy + oz * oz - self.radius * self.radius
 
         # Find discriminant
-        discriminant = b ** 2 - 4 * a * c
+        discriminant = b * b - 4 * a * c
 
         # if discriminant is negative there are no real roots
         if discriminant < 0:
             return []
 
-        # Discriminant is zero = one solution, positive == two solutions.
-        if np.isclose(discriminant, 0.0):
-            t = np.array([-b / (2 * a)])
+        # Discriminant is zero = one solution, positive == two solutions. The roots
+        # are in ascending order because a > 0.
+        if isclose(discriminant, 0.0):
+            t = (-b / (2 * a),)
         else:
-            t = np.array(
-                [
-                    (-b - np.sqrt(discriminant)) / (2 * a),
-                    (-b + np.sqrt(discriminant)) / (2 * a),
-                ]
-            )
-        t = np.sort(t)
-        hits = []
-        for distance in t:
-            if distance >= 0.0:
-                point = origin + distance * direction
-                hits.append(tuple(point.tolist()))
-        return tuple(hits)
+            root = math.sqrt(discriminant)
+            t = ((-b - root) / (2 * a), (-b + root) / (2 * a))
+        return tuple(
+            (ox + distance * dx, oy + distance * dy, oz + distance * dz)
+            for distance in t
+            if distance >= 0.0
+        )
+
+    def intersections_batch(self, positions, directions):
+        """ Returns the distances to the intersections of many rays with the sphere.
+
+            Parameters
+            ----------
+            positions : numpy.ndarray
+                Ray positions with shape (N, 3).
+            directions : numpy.ndarray
+                Ray directions with shape (N, 3).
+
+            Returns
+            -------
+            distances : numpy.ndarray
+                Array with shape (N, 2) of the distances along each ray to the
+                near and far intersection points. Intersections behind the ray
+                position, and both columns for rays which miss, are `nan`.
+        """
+        o = np.asarray(positions, dtype=float).reshape(-1, 3)
+        d = np.asarray(directions, dtype=float).reshape(-1, 3)
+        a = np.einsum("ij,ij->i", d, d)
+        b = 2.0 * np.einsum("ij,ij->i", d, o)
+        c = np.einsum("ij,ij->i", o, o) - self.radius * self.radius
+        discriminant = b * b - 4 * a * c
+        root = np.sqrt(np.maximum(discriminant, 0.0))
+        distances = np.column_stack(((-b - root) / (2 * a), (-b + root) / (2 * a)))
+        distances[(distances < 0.0) | (discriminant < 0.0)[:, None]] = np.nan
+        return distances
 
     def normal(self, surface_point):
         """ Normal faces outwards by convention.
         """
-        magnitude = np.linalg.norm(surface_point)
-        normal = np.array(surface_point) / magnitude
-        normal = tuple(normal.tolist())
-        return normal
+        x, y, z = surface_point
+        inverse = 1.0 / math.sqrt(x * x + y * y + z * z)
+        return (x * inverse, y * inverse, z * inverse)
 
     def is_entering(self, surface_point, direction) -> bool:
         """ Returns True if the ray at surface point with direction is heading 
@@ -80,7 +106,6 @@ class Sphere(Geometry):
         """
         if not self.is_on_surface(surface_point):
             raise ValueError("Point is not on surface.")
-        normal = self.normal(surface_point)
-        if np.dot(normal, direction) < 0.0:
-            return True
-        return False
+        nx, ny, nz = self.normal(surface_point)
+        dx, dy, dz = direction
+        return nx * dx + ny * dy + nz * dz < 0.0
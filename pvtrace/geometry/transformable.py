@@ -49,6 +49,7 @@ class Transformable(object):
             np.zeros(3, dtype=np.float) if location is None else np.array(location)
         )
         self._pose = translation_matrix(self._location)
+        self._inverse = None
 
     @classmethod
     def from_pose(cls, new_value):
@@ -68,6 +69,17 @@ class Transformable(object):
         self._pose = np.array(new_value)
         return self
 
+    @property
+    def inverse_pose(self):
+        """ The inverse of `pose`. This is cached and only recalculated when the
+            pose changes.
+        """
+        cached = self._inverse
+        if cached is None or not (cached[0] == self._pose).all():
+            cached = (self._pose.copy(), np.linalg.inv(self._pose))
+            self._inverse = cached
+        return cached[1]
+
     @property
     def location(self):
         return self._location
@@ -82,15 +94,23 @@ class Transformable(object):
         """ Apply a relative translation to the node location. Here
         the vector is defined in the parent's coordinate system.
         """
-        self._location += np.array(vector)
-        self._pose = np.dot(translation_matrix(vector), self._pose)
+        vector = np.array(vector)
+        self._location += vector
+        # Only the translation column of the pose changes; a new matrix is
+        # assigned so poses already handed out by `pose` are not modified.
+        pose = self._pose.copy()
+        pose[0:3, 3] += vector
+        self._pose = pose
         return self
 
     def rotate(self, angle, axis):
         """ Apply a body rotation to the node (location will be preserved). Here 
         axis specifies a direction in the node's coordinate system.
         """
-        self._pose = np.dot(
-            rotation_matrix(angle, axis, point=self._location), self._pose
-        )
+        # The rotation is around the current location so only the rotation part
+        # of the pose changes.
+        rotation = rotation_matrix(angle, axis)[0:3, 0:3]
+        pose = self._pose.copy()
+        pose[0:3, 0:3] = np.dot(rotation, self._pose[0:3, 0:3])
+        self._pose = pose
         return self
@@ -16,50 +16,27 @@ def on_aabb_surface(size, point, centre=(0.0, 0.0, 0.0), atol=EPS_ZERO):
     """ Surface test for axis-aligned bounding box with absolute distance 
         tolerance along surface normal direction.
     
+        Returns a tuple of a flag which is True if the point is on any surface and
+        the list of indices of the surfaces, in the order xmin, xmax, ymin, ymax,
+        zmin, zmax.
+
         >>> size = (1.0, 1.0, 1.0)
         >>> centre = (0.0, 0.0, 0.0)
-        >>> pt = np.array([0.5, np.random.uniform(-0.5*size[1], 0.5*size[1]), np.random.uniform(-0.5*size[2], 0.5*size[2])])
-        >>> atol = 1e-8
-        >>> on_aabb_surface(size, pt, centre=centre, atol=1e-8)
-        True
-        >>> on_aabb_surface(size, pt + np.array([atol, 0.0, 0.0]), centre=centre, atol=1e-8)
-        False
-        >>> on_aabb_surface(size, pt + np.array([atol, 0.0, 0.0]), centre=centre, atol=1e-8)
-        False
+        >>> on_aabb_surface(size, (0.5, 0.1, -0.2), centre=centre, atol=1e-8)
+        (True, [1])
+        >>> on_aabb_surface(size, (0.5, 0.5, -0.2), centre=centre, atol=1e-8)
+        (True, [1, 3])
+        >>> on_aabb_surface(size, (0.5 + 1e-8, 0.1, -0.2), centre=centre, atol=1e-8)
+        (False, [])
     """
-    origin = np.array(centre) - 0.5 * np.array(size)
-    extent = np.array(centre) + 0.5 * np.array(size)
-    # xmin
-    xmin_point = np.array(point)
-    xmin_point[0] = origin[0]
-    # print("point: {}, xmin_point: {}".format(point, xmin_point))
-    xmin_dist = distance_between(point, xmin_point)
-    # xmax
-    xmax_point = np.array(point)
-    xmax_point[0] = extent[0]
-    # print("point: {}, xmax_point: {}".format(point, xmax_point))
-    xmax_dist = distance_between(point, xmax_point)
-    # ymin
-    ymin_point = np.array(point)
-    ymin_point[1] = origin[1]
-    ymin_dist = distance_between(point, ymin_point)
-    # ymax
-    ymax_point = np.array(point)
-    ymax_point[1] = extent[1]
-    ymax_dist = distance_between(point, ymax_point)
-    # ymin
-    zmin_point = np.array(point)
-    zmin_point[2] = origin[2]
-    zmin_dist = distance_between(point, zmin_point)
-    # ymax
-    zmax_point = np.array(point)
-    zmax_point[2] = extent[2]
-    zmax_dist = distance_between(point, zmax_point)
-
-    dists = (xmin_dist, xmax_dist, ymin_dist, ymax_dist, zmin_dist, zmax_dist)
-    tests = [np.abs(dist) < (atol / 2) for dist in dists]
-    surfaces = np.where(np.array(tests) == True)[0].tolist()
-    return np.any(tests), surfaces
+    # Distance from the point to each face plane, in the order xmin, xmax, ymin,
+    # ymax, zmin, zmax. Plain floats because this is called for every surface hit.
+    tests = []
+    for p, c, s in zip(point, centre, size):
+        tests.append(abs(p - (c - 0.5 * s)) < (atol / 2))
+        tests.append(abs(p - (c + 0.5 * s)) < (atol / 2))
+    surfaces = [idx for idx, test in enumerate(tests) if test]
+    return any(tests), surfaces
 
 
 def aabb_intersection(min_point, max_point, ray_position, ray_direction):
@@ -70,7 +47,7 @@ def aabb_intersection(min_point, max_point, ray_position, ray_direction):
     Arguments
     ---------
     min_point: tuple like (x0, y0, z0) which is the minimum corner.
-    box_size: tuple like (x1, y1, z1) which is the maximum corner.
+    max_point: tuple like (x1, y1, z1) which is the maximum corner.
     ray_position: tuple like (x, y, z), the ray origin.
     ray_direction: tuple like (i, j, k), the ray direction.
     
@@ -84,50 +61,108 @@ def aabb_intersection(min_point, max_point, ray_position, ray_direction):
         Peter Shirley, "An Efficient and Robust Ray-Box Intersection Algorithm" 
         Journal of graphics tools, 10(1):49-54, 2005
     """
-    rpos = np.array(ray_position)
-    rdir = np.array(ray_direction)
-    origin = np.array(min_point)
-    extent = np.array(max_point)
-    pts = (origin, extent)
-
-    rinvd = 1.0 / rdir
-    rsgn = 1.0 / (rinvd < 0.0)
-    tmin = (origin[rsgn[0]] - rpos[0]) * rinvd[0]
-    tmax = (origin[1 - rsgn[0]] - rpos[0]) * rinvd[0]
-    tymin = (extent[rsgn[1]] - rpos[1]) * rinvd[1]
-    tymax = (extent[1 - rsgn[1]] - rpos[1]) * rinvd[1]
-
-    if (tmin > tymax) or (tymin > tmax):
-        return None
-
-    if tymin > tmin:
-        tmin = tymin
-    if tymax < tmax:
-        tmax = tymax
-
-    tzmin = (extent[rsgn[2]] - rpos[2]) * rinvd[2]
-    tzmax = (extent[1 - rsgn[2]] - rpos[2]) * rinvd[2]
-
-    if (tmin > tzmax) or (tzmin > tmax):
-        return None
-    if tzmin > tmin:
-        tmin = tzmin
-    if tzmax < tmax:
-        tmax = tzmax
+    tmin, tmax = -math.inf, math.inf
+    for lo, hi, p, d in zip(min_point, max_point, ray_position, ray_direction):
+        # Signed infinity for rays parallel to the slab, as in IEEE division
+        invd = 1.0 / d if d != 0.0 else math.copysign(math.inf, d)
+        if invd >= 0.0:
+            t0, t1 = (lo - p) * invd, (hi - p) * invd
+        else:
+            t0, t1 = (hi - p) * invd, (lo - p) * invd
+        if (tmin > t1) or (t0 > tmax):
+            return None
+        if t0 > tmin:
+            tmin = t0
+        if t1 < tmax:
+            tmax = t1
 
     # Calculate the hit coordinates then if the solution is in
     # the forward direction append to the hit list.
     hit_coordinates = []
-    pt1 = tuple(rpos + tmin * rdir)
-    pt2 = tuple(rpos + tmax * rdir)
-
-    if tmin >= 0.0:
-        hit_coordinates.append(pt1)
-    if tmax >= 0.0:
-        hit_coordinates.append(pt2)
+    for t in (tmin, tmax):
+        if t >= 0.0:
+            hit_coordinates.append(
+                tuple(p + t * d for p, d in zip(ray_position, ray_direction))
+            )
     return tuple(hit_coordinates)
 
 
+def slab_intersections(half_size, position, direction):
+    """ Returns the ray-box intersection distances for an axis-aligned box with
+        centre at the origin using the slab method.
+
+        Parameters
+        ----------
+        half_size : numpy.ndarray
+            Half of the box side lengths like (hx, hy, hz).
+        position : numpy.ndarray
+            Ray positions with shape (N, 3).
+        direction : numpy.ndarray
+            Ray directions with shape (N, 3).
+
+        Returns
+        -------
+        tnear, near_face, tfar, far_face : tuple of numpy.ndarray
+            Distances to the near and far intersections with the infinite line of
+            each ray, and index of the face (ordered xmin, xmax, ymin, ymax, zmin,
+            zmax) crossed at each point. The line misses the box where
+            `tnear > tfar`.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv = 1.0 / direction
+        t1 = (-half_size - position) * inv
+        t2 = (half_size - position) * inv
+    tlo = np.minimum(t1, t2)
+    thi = np.maximum(t1, t2)
+    # Rays parallel to a slab never cross it, they are either inside or outside.
+    parallel = direction == 0.0
+    inside = np.abs(position) <= half_size
+    tlo = np.where(parallel, np.where(inside, -np.inf, np.inf), tlo)
+    thi = np.where(parallel, np.where(inside, np.inf, -np.inf), thi)
+    rows = np.arange(position.shape[0])
+    near_axis = np.argmax(tlo, axis=1)
+    far_axis = np.argmin(thi, axis=1)
+    tnear = tlo[rows, near_axis]
+    tfar = thi[rows, far_axis]
+    # Entering through the min face when moving in the positive direction, leaving
+    # through the max face.
+    near_face = 2 * near_axis + (direction[rows, near_axis] < 0.0)
+    far_face = 2 * far_axis + (direction[rows, far_axis] > 0.0)
+    return tnear, near_face, tfar, far_face
+
+
+def aabb_intersection_batch(min_point, max_point, ray_positions, ray_directions):
+    """ Vectorised ray-box test of many rays with an axis-aligned box using the
+        slab method.
+
+        Parameters
+        ----------
+        min_point : tuple of float
+            The minimum corner of the box like (x0, y0, z0).
+        max_point : tuple of float
+            The maximum corner of the box like (x1, y1, z1).
+        ray_positions : numpy.ndarray
+            Ray positions with shape (N, 3).
+        ray_directions : numpy.ndarray
+            Ray directions with shape (N, 3).
+
+        Returns
+        -------
+        hit, tmin, tmax : tuple of numpy.ndarray
+            Whether each ray hits the box ahead of its position, and the distances
+            to the near and far intersections with the infinite line of the ray.
+    """
+    lower = np.asarray(min_point, dtype=float)
+    upper = np.asarray(max_point, dtype=float)
+    positions = np.asarray(ray_positions, dtype=float).reshape(-1, 3)
+    directions = np.asarray(ray_directions, dtype=float).reshape(-1, 3)
+    tmin, _, tmax, _ = slab_intersections(
+        0.5 * (upper - lower), positions - 0.5 * (upper + lower), directions
+    )
+    hit = tmax >= np.maximum(tmin, 0.0)
+    return hit, tmin, tmax
+
+
 def ray_z_cylinder(length, radius, ray_origin, ray_direction):
     """ Returns ray-cylinder intersection points for a cylinder aligned
         along the z-axis with centre at (0, 0, 0).
@@ -302,54 +337,118 @@ def ray_z_cylinder(length, radius, ray_origin, ray_direction):
         [2] https://www.scratchapixel.com/lessons/3d-basic-rendering/minimal-ray-tracer-rendering-simple-shapes/ray-plane-and-ray-disk-intersection
         
     """
-    p0 = np.array(ray_origin)
-    n0 = np.array(ray_direction)
-    xe, ye, ze = p0
-    xd, yd, zd = n0
+    # Plain floats throughout, this is called for every ray step.
+    xe, ye, ze = map(float, ray_origin)
+    xd, yd, zd = map(float, ray_direction)
+    half_length = 0.5 * length
 
     # Look for intersections on the cylinder surface
-    a = xd ** 2 + yd ** 2
+    a = xd * xd + yd * yd
     b = 2 * (xe * xd + ye * yd)
-    c = xe ** 2 + ye ** 2 - radius ** 2
-    tcyl = [
-        t for t in np.roots([a, b, c]) if np.isfinite(t) and np.isreal(t) and t >= 0
-    ]
-
-    # Look for intersections on the cap surfaces
-    with np.errstate(divide="ignore"):
-        # top cap
-        point = np.array([0.0, 0.0, 0.5 * length])
-        normal = np.array([0.0, 0.0, 1.0])  # outward facing at z = length
-        ttopcap = (point - p0).dot(normal) / n0.dot(normal)
-        # bottom cap
-        point = np.array([0.0, 0.0, -0.5 * length])
-        normal = np.array([0.0, 0.0, -1.0])  # outward facing at z = 0
-        tbotcap = (point - p0).dot(normal) / n0.dot(normal)
-        tcap = [t for t in (tbotcap, ttopcap) if np.isfinite(t) and t >= 0.0]
+    c = xe * xe + ye * ye - radius * radius
+    if a != 0.0:
+        discriminant = b * b - 4 * a * c
+        if discriminant < 0.0:
+            roots = ()
+        else:
+            root = math.sqrt(discriminant)
+            roots = ((-b - root) / (2 * a), (-b + root) / (2 * a))
+    elif b != 0.0:
+        roots = (-c / b,)
+    else:
+        roots = ()  # ray parallel to the cylinder axis
+    tcyl = [t for t in roots if t >= 0]
+
+    # Look for intersections on the cap surfaces at z = -L/2 (bottom) and z = L/2
+    # (top). A ray in the xy-plane never crosses them.
+    if zd != 0.0:
+        tbotcap = (-half_length - ze) / zd
+        ttopcap = (half_length - ze) / zd
+        tcap = [t for t in (tbotcap, ttopcap) if t >= 0.0]
+    else:
+        tcap = []
 
     # Reject point cap points which are not in the cap's circle radius
     # and cylinder points which outside the length.
-    cap_candidates = [(p0 + t * n0, t) for t in tcap]
-    cap_candidates = [
-        (point, t)
-        for (point, t) in cap_candidates
-        if np.sqrt(point[0] ** 2 + point[1] ** 2) < radius
-    ]
-    cyl_candidates = [(p0 + t * n0, t) for t in tcyl]
-    cyl_candidates = [
-        (point, t)
-        for (point, t) in cyl_candidates
-        if point[2] > -0.5 * length and point[2] < 0.5 * length
-    ]
-    intersection_info = tuple(cyl_candidates) + tuple(cap_candidates)
-    intersection_info = sorted(intersection_info, key=lambda pair: pair[1])
-    if len(intersection_info) == 0:
+    intersection_info = []
+    for t in tcyl:
+        z = ze + t * zd
+        if -half_length < z < half_length:
+            intersection_info.append(((xe + t * xd, ye + t * yd, z), t))
+    for t in tcap:
+        x, y = xe + t * xd, ye + t * yd
+        if x * x + y * y < radius * radius:
+            intersection_info.append(((x, y, ze + t * zd), t))
+    # A ray crosses the surface of the (convex) cylinder at most twice, so one
+    # compare-swap orders the hits. More can only appear at the rim where the
+    # side and cap solutions coincide.
+    n = len(intersection_info)
+    if n == 0:
         return ([], [])
-    points = tuple([tuple(p.tolist()) for p in list(zip(*intersection_info))[0]])
-    distances = tuple([float(d) for d in list(zip(*intersection_info))[1]])
+    elif n == 2:
+        first, second = intersection_info
+        if second[1] < first[1]:
+            intersection_info = [second, first]
+    elif n > 2:
+        intersection_info.sort(key=lambda pair: pair[1])
+    points = tuple(point for point, _ in intersection_info)
+    distances = tuple(t for _, t in intersection_info)
     return points, distances
 
 
+def ray_z_cylinder_batch(length, radius, ray_origins, ray_directions):
+    """ Vectorised version of `ray_z_cylinder` for many rays.
+
+        Parameters
+        ----------
+        length : float
+            The length of the cylinder
+        radius : float
+            The radius of the cylinder
+        ray_origins : numpy.ndarray
+            Ray positions with shape (N, 3).
+        ray_directions : numpy.ndarray
+            Ray direction unit vectors with shape (N, 3).
+
+        Returns
+        -------
+        distances : numpy.ndarray
+            Array with shape (N, 2) of the distances along each ray to the near and
+            far intersection points, the same layout as `Box.intersections_batch`
+            and `Sphere.intersections_batch`. Intersections behind the ray
+            position, and both columns for rays which miss, are `nan`. A ray
+            starting inside the cylinder has a `nan` near column.
+    """
+    origins = np.asarray(ray_origins, dtype=float).reshape(-1, 3)
+    directions = np.asarray(ray_directions, dtype=float).reshape(-1, 3)
+    xe, ye, ze = origins.T
+    xd, yd, zd = directions.T
+    half_length = 0.5 * length
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Cylinder surface, rays parallel to the axis never cross it
+        a = xd * xd + yd * yd
+        b = 2 * (xe * xd + ye * yd)
+        c = xe * xe + ye * ye - radius * radius
+        discriminant = b * b - 4 * a * c
+        root = np.sqrt(np.where(discriminant < 0.0, np.nan, discriminant))
+        tcyl = np.stack(((-b - root) / (2 * a), (-b + root) / (2 * a)), axis=1)
+        # Bottom and top caps, rays in the xy-plane never cross them
+        tcap = np.stack(((-half_length - ze) / zd, (half_length - ze) / zd), axis=1)
+    tcyl[~np.isfinite(tcyl)] = np.nan
+    tcap[~np.isfinite(tcap)] = np.nan
+    z = ze[:, None] + tcyl * zd[:, None]
+    tcyl[~((z > -half_length) & (z < half_length))] = np.nan
+    x = xe[:, None] + tcap * xd[:, None]
+    y = ye[:, None] + tcap * yd[:, None]
+    tcap[~(x * x + y * y < radius * radius)] = np.nan
+    # A line crosses the surface of the convex cylinder at most twice, the near
+    # and far points are the extremes of the valid candidates.
+    t = np.concatenate((tcyl, tcap), axis=1)
+    distances = np.column_stack((np.fmin.reduce(t, axis=1), np.fmax.reduce(t, axis=1)))
+    distances[distances < 0.0] = np.nan
+    return distances
+
+
 # Equality tests
 
 
@@ -358,7 +457,11 @@ def close_to_zero(value) -> bool:
 
 
 def points_equal(point1: tuple, point2: tuple) -> bool:
-    return close_to_zero(distance_between(point1, point2))
+    # Compare squared distances to avoid the square root
+    x1, y1, z1 = point1
+    x2, y2, z2 = point2
+    dx, dy, dz = x1 - x2, y1 - y2, z1 - z2
+    return dx * dx + dy * dy + dz * dz < EPS_ZERO * EPS_ZERO
 
 
 def floats_close(a, b):
@@ -376,9 +479,8 @@ def allinrange(x, x_range):
         x_range : tuple of float
             A tuple defining a range like (xmin, xmax)
     """
-    if isinstance(x, (int, float, np.float, np.int)):
-        x = np.array([x])
-    return np.where(np.logical_or(x < x_range[0], x > x_range[1]))[0].size == 0
+    x = np.asarray(x)
+    return not ((x < x_range[0]) | (x > x_range[1])).any()
 
 
 # Vector helpers
@@ -389,22 +491,35 @@ def flip(vector):
 
 
 def magnitude(vector):
-    return np.sqrt(np.dot(np.array(vector), np.array(vector)))
+    x, y, z = vector
+    return math.sqrt(x * x + y * y + z * z)
 
 
 def norm(vector):
-    return np.array(vector) / np.linalg.norm(vector)
+    x, y, z = vector
+    inv = 1.0 / math.sqrt(x * x + y * y + z * z)
+    return np.array((x * inv, y * inv, z * inv))
+
+
+def isclose(a, b, rtol=1e-05, atol=1e-08) -> bool:
+    """ Scalar `np.isclose` without the array overhead, for use in the
+        per-ray code paths.
+    """
+    return abs(a - b) <= atol + rtol * abs(b)
 
 
 def angle_between(normal, vector):
-    normal = np.array(normal)
-    vector = np.array(vector)
-    if np.allclose(normal, vector):
-        return 0.0
-    elif np.allclose(-normal, vector):
-        return np.pi
-    dot = np.dot(normal, vector)
-    return np.arccos(dot)
+    """ Returns the angle between two unit vectors in radians.
+    """
+    nx, ny, nz = normal
+    vx, vy, vz = vector
+    dot = nx * vx + ny * vy + nz * vz
+    # Clamp rounding errors, acos is exactly 0 and pi at the end points
+    if dot > 1.0:
+        dot = 1.0
+    elif dot < -1.0:
+        dot = -1.0
+    return math.acos(dot)
 
 
 def is_ahead(position, direction, point):
@@ -412,9 +527,7 @@ def is_ahead(position, direction, point):
     """
     if points_equal(position, point):
         return False
-    d1 = np.dot(self.direction, np.array(point))
-    d2 = np.dot(self.direction, self.position)
-    return (d1 - d2) > 0
+    return intersection_point_is_ahead(position, direction, point)
 
 
 def smallest_angle_between(normal, vector):
@@ -423,9 +536,10 @@ def smallest_angle_between(normal, vector):
 
 
 def distance_between(point1: tuple, point2: tuple) -> float:
-    v = np.array(point1) - np.array(point2)
-    d = np.linalg.norm(v)
-    return d
+    x1, y1, z1 = point1
+    x2, y2, z2 = point2
+    dx, dy, dz = x1 - x2, y1 - y2, z1 - z2
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
 
 
 def intersection_point_is_ahead(ray_position, ray_direction, intersection_point):
@@ -435,6 +549,7 @@ def intersection_point_is_ahead(ray_position, ray_direction, intersection_point)
         -----
         The intersection point must be a point on the line, p(a) = p0 + a * n.
     """
-    return (
-        np.dot(ray_direction, intersection_point) - np.dot(ray_direction, ray_position)
-    ) > EPS_ZERO
+    px, py, pz = ray_position
+    dx, dy, dz = ray_direction
+    x, y, z = intersection_point
+    return (dx * (x - px) + dy * (y - py) + dz * (z - pz)) > EPS_ZERO
@@ -2,6 +2,7 @@ from typing import Optional, Sequence, Generator, Iterator
 import numpy as np
 from dataclasses import replace
 from pvtrace.light.ray import Ray
+from pvtrace.material.utils import accepts_size
 import functools
 import logging
 
@@ -26,35 +27,59 @@ circular_mask: callable
 """
 
 
-def default_wavelength():
-    return 555.0
+def default_wavelength(size=None):
+    if size is None:
+        return 555.0
+    return np.full(size, 555.0)
 
 
-def default_position():
-    return (0.0, 0.0, 0.0)
+def default_position(size=None):
+    if size is None:
+        return (0.0, 0.0, 0.0)
+    return np.zeros((size, 3))
 
 
-def default_direction():
-    return (0.0, 0.0, 1.0)
+def default_direction(size=None):
+    if size is None:
+        return (0.0, 0.0, 1.0)
+    return np.tile((0.0, 0.0, 1.0), (size, 1))
 
 
-def rectangular_mask(X, Y):
-    return (np.random.uniform(-X, X), np.random.uniform(-Y, Y), 0.0)
+def rectangular_mask(X, Y, size=None):
+    if size is None:
+        # One draw for both coordinates, same values as np.random.uniform(-X, X)
+        u, v = np.random.random(2).tolist()
+        return (-X + 2 * X * u, -Y + 2 * Y * v, 0.0)
+    x = np.random.uniform(-X, X, size)
+    y = np.random.uniform(-Y, Y, size)
+    return np.column_stack((x, y, np.zeros(size)))
 
 
-def circular_mask(radius: float) -> Sequence[float]:
-    rads = np.random.uniform(0, 2.0 * np.pi)
-    r = np.sqrt(np.random.uniform()) * radius
+def circular_mask(radius: float, size=None) -> Sequence[float]:
+    if size is None:
+        # Rejection sampling of the square for single points, on average 4/pi
+        # draws are needed which is cheaper than the sqrt, cos and sin below.
+        while True:
+            x, y = (2.0 * np.random.random(2) - 1.0).tolist()
+            if x * x + y * y <= 1.0:
+                return (x * radius, y * radius, 0.0)
+    rads = np.random.uniform(0, 2.0 * np.pi, size)
+    r = np.sqrt(np.random.uniform(size=size)) * radius
     x = r * np.cos(rads)
     y = r * np.sin(rads)
-    return (x, y, 0.0)
-
-
-def cube_mask(X, Y, Z):
-    return (
-        np.random.uniform(-X, X),
-        np.random.uniform(-Y, Y),
-        np.random.uniform(-Z, Z),
+    return np.column_stack((x, y, np.zeros(size)))
+
+
+def cube_mask(X, Y, Z, size=None):
+    if size is None:
+        u, v, w = np.random.random(3).tolist()
+        return (-X + 2 * X * u, -Y + 2 * Y * v, -Z + 2 * Z * w)
+    return np.column_stack(
+        (
+            np.random.uniform(-X, X, size),
+            np.random.uniform(-Y, Y, size),
+            np.random.uniform(-Z, Z, size),
+        )
     )
 
 
@@ -97,6 +122,12 @@ class Light(object):
         import functools
         Light(position=functools.partial(circular_mask, 1)
     
+    To sample wavelengths from a spectrum, accepting `size` so that many rays can be
+    sampled in one call::
+
+        dist = Distribution(x, y)
+        Light(wavelength=lambda size=None: dist.sample(np.random.uniform(size=size)))
+    
     Any combination of spatial and divergence delegates can be used to generate the
     required distribution of rays.
     """
@@ -128,6 +159,9 @@ class Light(object):
         If delegate functions are not supplied the light source will emit monochromatic
         light for wavelength 555 nanometers from the origin of the node along the
         positive z-direction.
+
+        Delegates which also accept a `size` keyword argument, like the functions in
+        this module and `cone`, are called once to sample all rays in `emit_batch`.
         """
         self.wavelength = wavelength if wavelength is not None else default_wavelength
         self.position = position if position is not None else default_position
@@ -146,16 +180,34 @@ class Light(object):
         """
         if num_rays is None or num_rays == 0:
             return
-        count = 0
-        while True:
-            count += 1
-            if num_rays is not None and count > num_rays:
-                break
-            ray = Ray(
-                wavelength=self.wavelength(),
-                position=self.position(),
-                direction=self.direction(),
+        wavelength, position, direction = self.wavelength, self.position, self.direction
+        name = self.name
+        for _ in range(num_rays):
+            yield Ray(
+                wavelength=wavelength(),
+                position=position(),
+                direction=direction(),
                 is_alive=True,
-                source=self.name,
+                source=name,
             )
-            yield ray
+
+    def emit_batch(self, num_rays):
+        """ Returns arrays of wavelength, position and direction for `num_rays`
+            rays sampled from the delegates, without creating `Ray` objects.
+
+            Returns
+            -------
+            tuple of numpy.ndarray
+                Wavelengths with shape (n,), positions with shape (n, 3) and
+                directions with shape (n, 3).
+        """
+
+        def sample(delegate, shape):
+            if accepts_size(delegate):
+                return np.reshape(delegate(size=num_rays), shape)
+            return np.reshape([delegate() for _ in range(num_rays)], shape)
+
+        wavelength = sample(self.wavelength, (num_rays,))
+        position = sample(self.position, (num_rays, 3))
+        direction = sample(self.direction, (num_rays, 3))
+        return wavelength, position, direction
@@ -317,30 +317,20 @@ class Luminophore(Scatterer):
         else:
             raise ValueError("Luminophore `emission` arg has wrong type.")
 
-    def emit(self, ray: "Ray", method="kT", T=300.0, **kwargs) -> "Ray":
-        """ Change ray direction or wavelength based on physics of the interaction.
-            
+    def sample_wavelength(self, nanometers, method="kT", T=300.0):
+        """ Returns emission wavelengths sampled from the emission spectrum.
+
             Parameters
             ----------
-            ray: Ray
-                The ray when it was absorbed.
+            nanometers: float or numpy.ndarray
+                The wavelength of the absorbed ray(s).
             method: str
-                Either `'kT'`, `'redshift'` or `'full'`.
-            
-                `'kT'` option allowed emitted rays to have a wavelength
-                within 3kT of the absorbed value.
-        
-                `'redshift'` option ensures the emitted ray has a longer of equal
-                wavelength.
-        
-                `'full'` option samples the full emission spectrum allowing the emitted
-                ray to take any value.
+                Either `'kT'`, `'redshift'` or `'full'`, see `emit`.
             T: float
                 The temperature to use in the `'kT'` method.
         """
-        direction = self.phase_function()
         dist = self._ems_dist
-        nm = ray.wavelength
+        nm = nanometers
         # Different ways of sampling the emission distribution.
         if method == "kT":
             # Known issue: this can blue shift outside simulation range!
@@ -361,7 +351,32 @@ class Luminophore(Scatterer):
             # Emission energy is sampled from full distribution
             p1 = 0.0
         p2 = 1.0
-        gamma = np.random.uniform(p1, p2)
+        gamma = np.random.uniform(p1, p2, size=np.shape(nanometers) or None)
         wavelength = dist.sample(gamma)
+        return wavelength
+
+    def emit(self, ray: "Ray", method="kT", T=300.0, **kwargs) -> "Ray":
+        """ Change ray direction or wavelength based on physics of the interaction.
+            
+            Parameters
+            ----------
+            ray: Ray
+                The ray when it was absorbed.
+            method: str
+                Either `'kT'`, `'redshift'` or `'full'`.
+            
+                `'kT'` option allowed emitted rays to have a wavelength
+                within 3kT of the absorbed value.
+        
+                `'redshift'` option ensures the emitted ray has a longer of equal
+                wavelength.
+        
+                `'full'` option samples the full emission spectrum allowing the emitted
+                ray to take any value.
+            T: float
+                The temperature to use in the `'kT'` method.
+        """
+        direction = self.phase_function()
+        wavelength = self.sample_wavelength(ray.wavelength, method=method, T=T)
         ray = replace(ray, direction=direction, wavelength=wavelength, source=self.name)
         return ray
@@ -103,6 +103,22 @@ class FresnelSurfaceDelegate(SurfaceDelegate):
     """ Fresnel reflection and refraction on the surface.
     """
 
+    #: Most recent (ray, geometry, normal) returned by `surface_normal`
+    _last_normal = None
+
+    def surface_normal(self, ray, geometry):
+        """ Returns the surface normal of the geometry at the ray's position.
+
+            The delegate methods are called more than once with the same ray for
+            each surface event, so the most recent normal is cached.
+        """
+        last = self._last_normal
+        if last is not None and last[0] is ray and last[1] is geometry:
+            return last[2]
+        normal = geometry.normal(ray.position)
+        self._last_normal = (ray, geometry, normal)
+        return normal
+
     def reflectivity(self, surface, ray, geometry, container, adjacent):
         """ Returns the reflectivity given the interaction.
         
@@ -123,7 +139,7 @@ class FresnelSurfaceDelegate(SurfaceDelegate):
         n1 = container.geometry.material.refractive_index
         n2 = adjacent.geometry.material.refractive_index
         # Be tolerance with definition of surface normal
-        normal = geometry.normal(ray.position)
+        normal = self.surface_normal(ray, geometry)
         if np.dot(normal, ray.direction) < 0.0:
             normal = flip(normal)
         angle = angle_between(normal, np.array(ray.direction))
@@ -146,7 +162,7 @@ class FresnelSurfaceDelegate(SurfaceDelegate):
             adjacent: Node
                 The node that would contain the ray if transmitted.
         """
-        normal = geometry.normal(ray.position)
+        normal = self.surface_normal(ray, geometry)
         direction = ray.direction
         reflected_direction = specular_reflection(direction, normal)
         return tuple(reflected_direction.tolist())
@@ -170,7 +186,7 @@ class FresnelSurfaceDelegate(SurfaceDelegate):
         n1 = container.geometry.material.refractive_index
         n2 = adjacent.geometry.material.refractive_index
         # Be tolerance with definition of surface normal
-        normal = geometry.normal(ray.position)
+        normal = self.surface_normal(ray, geometry)
         if np.dot(normal, ray.direction) < 0.0:
             normal = flip(normal)
         refracted_direction = fresnel_refraction(ray.direction, normal, n1, n2)
@@ -1,4 +1,6 @@
 import numpy as np
+import inspect
+import math
 from pvtrace.geometry.utils import flip
 
 # Fresnel
@@ -6,18 +8,14 @@ from pvtrace.geometry.utils import flip
 
 def fresnel_reflectivity(angle, n1, n2):
     # Catch TIR case
-    if n2 < n1 and angle > np.arcsin(n2 / n1):
+    if n2 < n1 and angle > math.asin(n2 / n1):
         return 1.0
-    c = np.cos(angle)
-    s = np.sin(angle)
-    k = np.sqrt(1 - (n1 / n2 * s) ** 2)
-    Rs1 = n1 * c - n2 * k
-    Rs2 = n1 * c + n2 * k
-    Rs = (Rs1 / Rs2) ** 2
-    Rp1 = n1 * k - n2 * c
-    Rp2 = n1 * k + n2 * c
-    Rp = (Rp1 / Rp2) ** 2
-    r = 0.5 * (Rs + Rp)
+    c = math.cos(angle)
+    s = n1 / n2 * math.sin(angle)
+    k = math.sqrt(max(0.0, 1 - s * s))
+    Rs = (n1 * c - n2 * k) / (n1 * c + n2 * k)
+    Rp = (n1 * k - n2 * c) / (n1 * k + n2 * c)
+    r = 0.5 * (Rs * Rs + Rp * Rp)
     return r
 
 
@@ -36,7 +34,7 @@ def fresnel_refraction(direction, normal, n1, n2):
     normal = np.array(normal)
     n = n1 / n2
     dot = np.dot(vector, normal)
-    c = np.sqrt(1 - n ** 2 * (1 - dot ** 2))
+    c = math.sqrt(max(0.0, 1 - n * n * (1 - dot * dot)))
     sign = 1
     if dot < 0.0:
         sign = -1
@@ -98,18 +96,36 @@ def spherical_to_cart(theta, phi, r=1):
     return cart
 
 
+def accepts_size(func) -> bool:
+    """ Returns True if the sampling function takes a `size` keyword argument, like
+        `cone`, and so can draw many samples in one call.
+    """
+    try:
+        return "size" in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _directions(theta, phi, size):
+    """ Cartesian directions with shape (3,), or (size, 3) when size is not None.
+    """
+    coords = spherical_to_cart(theta, phi)
+    if size is None:
+        return coords
+    return coords.reshape(size, 3)
+
+
 #  Volume scattering
 
 
-def isotropic():
+def isotropic(size=None):
     """ Isotropic phase function.
     """
-    g1, g2 = np.random.uniform(0, 1, 2)
+    g1, g2 = np.random.uniform(0, 1, 2 if size is None else (2, size))
     phi = 2 * np.pi * g1
     mu = 2 * g2 - 1  # mu = cos(theta)
     theta = np.arccos(mu)
-    coords = spherical_to_cart(theta, phi)
-    return coords
+    return _directions(theta, phi, size)
 
 
 def henyey_greenstein(g=0.0):
@@ -132,8 +148,11 @@ def henyey_greenstein(g=0.0):
 # Light source /surface scattering
 
 
-def cone(theta_max):
+def cone(theta_max, size=None):
     """ Samples directions within a cone of solid angle defined by `theta_max`.
+
+        Returns a direction with shape (3,), or `size` directions with shape
+        (size, 3).
     
         Notes
         -----
@@ -148,21 +167,19 @@ def cone(theta_max):
     """
     if np.isclose(theta_max, 0.0) or theta_max > np.pi / 2:
         raise ValueError("Expected 0 < theta_max <= pi/2")
-    p1, p2 = np.random.uniform(0, 1, 2)
+    p1, p2 = np.random.uniform(0, 1, 2 if size is None else (2, size))
     theta = np.arcsin(np.sqrt(p1) * np.sin(theta_max))
     phi = 2 * np.pi * p2
-    coords = spherical_to_cart(theta, phi)
-    return coords
+    return _directions(theta, phi, size)
 
 
-def lambertian():
+def lambertian(size=None):
     """ Samples the Lambertian directions emitted from a surface with normal
         pointing along the positive z-direction.
         
         This never produces directions in the negative z-direction.
     """
-    p1, p2 = np.random.uniform(0, 1, 2)
+    p1, p2 = np.random.uniform(0, 1, 2 if size is None else (2, size))
     theta = np.arcsin(np.sqrt(p1))
     phi = 2 * np.pi * p2
-    coords = spherical_to_cart(theta, phi)
-    return coords
+    return _directions(theta, phi, size)
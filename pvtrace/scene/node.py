@@ -52,7 +52,7 @@ class Node(NodeMixin, Transformable):
             return np.identity(4)
         upwards, common, downwards = Walker().walk(self, node)
         transforms = tuple(map(lambda x: x.pose, upwards))
-        transforms = transforms + tuple(map(lambda x: np.linalg.inv(x.pose), downwards))
+        transforms = transforms + tuple(map(lambda x: x.inverse_pose, downwards))
         if len(transforms) == 1:
             transform = transforms[0]
         else:
@@ -127,10 +127,19 @@ class Node(NodeMixin, Transformable):
                 all_intersections.append(intersection)
         all_intersections = tuple(all_intersections)
 
+        if not self.children:
+            return all_intersections
+
+        origin = np.array(ray_origin, dtype=float)
+        direction = np.array(ray_direction, dtype=float)
         for child in self.children:
-            # Intersections with node's geometry
-            ray_origin_in_child = self.point_to_node(ray_origin, child)
-            ray_direction_in_child = self.vector_to_node(ray_direction, child)
+            # Intersections with node's geometry. The child's inverse pose
+            # transforms from this node into the child's frame.
+            mat = child.inverse_pose
+            ray_origin_in_child = tuple(
+                (np.dot(mat[0:3, 0:3], origin) + mat[0:3, 3]).tolist()
+            )
+            ray_direction_in_child = tuple(np.dot(mat[0:3, 0:3], direction).tolist())
             # Intersections with node's subtree
             intersections_in_child = child.intersections(
                 ray_origin_in_child, ray_direction_in_child
@@ -67,19 +67,53 @@ class Scene(object):
                     found_nodes.extend(node.geometry.material.components)
         return found_nodes
 
-    def emit(self, num_rays):
+    def emit(self, num_rays, offset=0):
         """ Rays are emitted in the coordinate system of the world node.
         
             Internally the scene cycles through Light nodes, askes them to emit
-            a ray and the converts the ray to the world coordinate system.
+            a ray and the converts the ray to the world coordinate system. The
+            cycle starts at ray index `offset`.
         """
         world = self.root
         lights = self.light_nodes
-        for idx in range(num_rays):
+        for idx in range(offset, offset + num_rays):
             light = lights[idx % len(lights)]
             for ray in light.emit(1):
                 yield ray.representation(light, world)
 
+    def emit_batch(self, num_rays, offset=0, node=None):
+        """ Rays are emitted as arrays in the coordinate system of `node`, or
+            the world node if `node` is None.
+
+            Cycles through the Light nodes as `emit` does, starting with ray
+            index `offset`, but samples each light's rays in one go.
+
+            Returns
+            -------
+            tuple of numpy.ndarray
+                Wavelengths (n,), positions (n, 3), directions (n, 3) and the
+                names of the light sources (n,).
+        """
+        node = self.root if node is None else node
+        lights = self.light_nodes
+        which = (np.arange(num_rays) + offset) % len(lights)
+        wavelength = np.empty(num_rays)
+        position = np.empty((num_rays, 3))
+        direction = np.empty((num_rays, 3))
+        source = np.empty(num_rays, dtype=object)
+        for k, light_node in enumerate(lights):
+            idx = np.flatnonzero(which == k)
+            if idx.size == 0:
+                continue
+            light = light_node.light
+            nm, pos, vec = light.emit_batch(idx.size)
+            mat = light_node.transformation_to(node)
+            wavelength[idx] = nm
+            position[idx] = np.dot(pos, mat[0:3, 0:3].T) + mat[0:3, 3]
+            direction[idx] = np.dot(vec, mat[0:3, 0:3].T)
+            source[idx] = light.name
+        return wavelength, position, direction, source
+
     def intersections(self, ray_origin, ray_direction) -> Sequence[Tuple[Node, Tuple]]:
         """ Intersections with ray and scene. Ray is defined in the root node's
         coordinate system.
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+from pvtrace.algorithm.batch_tracer import slab_intersections, follow_box, EVENT_NAMES
+from pvtrace.material.component import Absorber
+
+
+class TestBatchTracer:
+
+    def test_slab_intersections(self):
+        half = np.array([0.5, 0.5, 0.5])
+        pos = np.array([[-2.0, 0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 2.0, 0.0]])
+        vec = np.array([[1.0, 0.0, 0.0], [0.0, 0.0, -1.0], [1.0, 0.0, 0.0]])
+        tnear, near_face, tfar, far_face = slab_intersections(half, pos, vec)
+        assert np.allclose(tnear[:2], (1.5, -0.5))
+        assert np.allclose(tfar[:2], (2.5, 0.5))
+        assert near_face[0] == 0 and far_face[0] == 1  # xmin then xmax
+        assert far_face[1] == 4  # zmin
+        assert tnear[2] > tfar[2]  # miss
+
+    def test_follow_box_index_matched(self):
+        # No refraction or reflection when the refractive indices are the same.
+        entrance, exit = follow_box(
+            [(-2.0, 0.0, 0.0)],
+            [(1.0, 0.0, 0.0)],
+            [555.0],
+            ["Light"],
+            (1.0, 1.0, 1.0),
+            (10.0, 10.0, 10.0),
+            [],
+            n0=1.0,
+            n1=1.0,
+        )
+        assert EVENT_NAMES[entrance["event"]].tolist() == ["transmit"]
+        assert np.allclose(entrance["position"], [(-0.5, 0.0, 0.0)])
+        # Stored at the penultimate event before exiting the world
+        assert EVENT_NAMES[exit["event"]].tolist() == ["transmit"]
+        assert np.allclose(exit["position"], [(0.5, 0.0, 0.0)])
+        assert np.allclose(exit["direction"], [(1.0, 0.0, 0.0)])
+        assert np.allclose(exit["travelled"], [2.5])
+
+    def test_follow_box_mirror_facet(self):
+        reflectivity = np.full(6, np.nan)
+        reflectivity[0] = 1.0  # xmin is a perfect mirror
+        entrance, exit = follow_box(
+            [(-2.0, 0.0, 0.0)],
+            [(1.0, 0.0, 0.0)],
+            [555.0],
+            ["Light"],
+            (1.0, 1.0, 1.0),
+            (10.0, 10.0, 10.0),
+            [],
+            facet_reflectivity=reflectivity,
+        )
+        assert EVENT_NAMES[entrance["event"]].tolist() == ["reflect"]
+        assert np.allclose(entrance["direction"], [(-1.0, 0.0, 0.0)])
+        assert EVENT_NAMES[exit["event"]].tolist() == ["reflect"]
+
+    def test_follow_box_absorbed(self):
+        entrance, exit = follow_box(
+            [(0.0, 0.0, 0.0)] * 10,
+            [(0.0, 0.0, 1.0)] * 10,
+            [555.0] * 10,
+            ["Light"] * 10,
+            (1.0, 1.0, 1.0),
+            (10.0, 10.0, 10.0),
+            [Absorber(1e6)],
+        )
+        assert set(EVENT_NAMES[entrance["event"]].tolist()) == {"absorb"}
+        assert set(EVENT_NAMES[exit["event"]].tolist()) == {"absorb"}
+        assert np.all(exit["position"][:, 2] < 0.5)
@@ -4,6 +4,7 @@ import os
 import numpy as np
 from anytree import RenderTree
 from pvtrace.geometry.box import Box
+from pvtrace.geometry.mesh import Mesh
 
 
 class TestBox:
@@ -47,6 +48,40 @@ class TestBox:
         rd = (1.0, 0.0, 0.0)
         assert b.intersections(ro, rd) == ((-0.5, 0.0, 0.0), (0.5, 0.0, 0.0))
 
+    def test_intersection_matches_mesh(self):
+        np.random.seed(1)
+        b = Box(size=(5.0, 2.0, 0.5))
+        for _ in range(100):
+            origin = tuple(np.random.uniform(-4, 4, 3))
+            direction = np.random.randn(3)
+            direction = tuple(direction / np.linalg.norm(direction))
+            expected = Mesh.intersections(b, origin, direction)
+            points = b.intersections(origin, direction)
+            assert len(points) == len(expected)
+            if len(points) > 0:
+                assert np.allclose(points, expected)
+
+    def test_contains_matches_mesh(self):
+        np.random.seed(3)
+        b = Box(size=(5.0, 2.0, 0.5))
+        for point in np.random.uniform(-3, 3, (100, 3)):
+            assert b.contains(tuple(point)) == Mesh.contains(b, tuple(point))
+
+    def test_intersections_batch(self):
+        np.random.seed(2)
+        b = Box(size=(5.0, 2.0, 0.5))
+        origins = np.random.uniform(-4, 4, (100, 3))
+        directions = np.random.randn(100, 3)
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+        distances = b.intersections_batch(origins, directions)
+        assert distances.shape == (100, 2)
+        for origin, direction, row in zip(origins, directions, distances):
+            points = b.intersections(tuple(origin), tuple(direction))
+            expected = [origin + t * direction for t in row if not np.isnan(t)]
+            assert len(points) == len(expected)
+            if len(points) > 0:
+                assert np.allclose(points, expected)
+
     def test_normal(self):
         b = Box(size=(1,1,1))
         assert np.allclose(b.normal(( 0.5,  0.0,  0.0)), ( 1.0,  0.0,  0.0))
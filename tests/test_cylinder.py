@@ -5,6 +5,9 @@ import numpy as np
 from anytree import RenderTree
 from pvtrace.geometry.utils import norm
 from pvtrace.geometry.cylinder import Cylinder
+from pvtrace.geometry.box import Box
+from pvtrace.geometry.sphere import Sphere
+from pvtrace.common.errors import GeometryError
 
 
 class TestCylinder:
@@ -21,6 +24,15 @@ class TestCylinder:
         assert obj.is_on_surface((0.0, 0.0, 0.6)) == False
         assert obj.is_on_surface((0.0, 1.1, 0.0)) == False
         
+    def test_intersection_points_are_on_surface(self):
+        np.random.seed(0)
+        obj = Cylinder(length=2.0, radius=0.7)
+        for _ in range(200):
+            position = tuple(np.random.uniform(-2, 2, 3))
+            direction = tuple(norm(np.random.randn(3)))
+            for point in obj.intersections(position, direction):
+                assert obj.is_on_surface(point) == True
+
     def test_contains(self):
         obj = Cylinder(length=1.0, radius=1.0)
         assert obj.contains((0.0, 0.0, 0.5)) == False
@@ -44,13 +56,79 @@ class TestCylinder:
         points = obj.intersections(ro, rd)
         assert all([np.allclose(a, b) for a, b in zip(expected, points)])
 
+    def test_intersections_batch(self):
+        np.random.seed(1)
+        obj = Cylinder(length=2.0, radius=0.7)
+        positions = np.random.uniform(-2, 2, (200, 3))
+        directions = np.random.randn(200, 3)
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+        distances = obj.intersections_batch(positions, directions)
+        assert distances.shape == (200, 2)
+        for p, d, row in zip(positions, directions, distances):
+            points = obj.intersections(tuple(p), tuple(d))
+            expected = [p + t * d for t in row if not np.isnan(t)]
+            assert len(points) == len(expected)
+            if len(points) > 0:
+                assert np.allclose(points, expected)
+
+    def test_intersections_batch_layout_matches_other_geometries(self):
+        # Columns are [near, far] with nan for points behind the ray or misses
+        positions = np.array(
+            [
+                (0.0, 0.0, 0.0),  # inside
+                (-3.0, 0.0, 0.0),  # outside, hits twice
+                (3.0, 0.0, 0.0),  # outside, both hits behind
+                (-3.0, 5.0, 0.0),  # miss
+                (0.0, 0.0, -3.0),  # through the end caps
+            ]
+        )
+        directions = np.array([(1.0, 0.0, 0.0)] * 4 + [(0.0, 0.0, 1.0)])
+        expected = np.array(
+            [
+                (np.nan, 1.0),
+                (2.0, 4.0),
+                (np.nan, np.nan),
+                (np.nan, np.nan),
+                (2.0, 4.0),
+            ]
+        )
+        for obj in (
+            Cylinder(length=2.0, radius=1.0),
+            Box((2.0, 2.0, 2.0)),
+            Sphere(radius=1.0),
+        ):
+            distances = obj.intersections_batch(positions, directions)
+            assert np.allclose(distances, expected, equal_nan=True)
+
     def test_normal(self):
         obj = Cylinder(length=1.0, radius=1.0)
         assert np.allclose(obj.normal((0.0, 0.0, 0.5)), (0.0, 0.0, 1.0))
         assert np.allclose(obj.normal((0.0, 0.0, -0.5)), (0.0, 0.0, -1.0))
         assert np.allclose(obj.normal((0.0, 1.0, 0.0)), (0.0, 1.0, 0.0))
         assert np.allclose(obj.normal((0.0, -1.0, 0.0)), (0.0, -1.0, 0.0))
-        
+        c = np.sqrt(0.5)
+        assert np.allclose(obj.normal((c, c, 0.1)), (c, c, 0.0))
+        with pytest.raises(GeometryError):
+            obj.normal((0.5, 0.0, 0.0))
+
+    def test_normal_agrees_with_is_entering(self):
+        obj = Cylinder(length=1.0, radius=1.0)
+        c = np.sqrt(0.5)
+        points = (
+            (1.0, 0.0, 0.5),  # rim of the top cap
+            (0.0, -1.0, -0.5),  # rim of the bottom cap
+            (c, c, 0.5 - 5e-6),  # side wall just below the top cap
+            (0.0, 1.0, -0.5 + 5e-6),  # side wall just above the bottom cap
+        )
+        for point in points:
+            assert obj.is_on_surface(point) == True
+            normal = obj.normal(point)
+            for direction in (norm((1.0, 1.0, -1.0)), norm((-1.0, -1.0, 1.0))):
+                entering = obj.is_entering(point, direction)
+                assert entering == (np.dot(normal, direction) < 0.0)
+        assert np.allclose(obj.normal(points[0]), (0.0, 0.0, 1.0))
+        assert np.allclose(obj.normal(points[2]), (c, c, 0.0))
+
 
     def test_is_entering_true(self):
         obj = Cylinder(length=1.0, radius=1.0)
@@ -0,0 +1,38 @@
+import pytest
+import math
+import numpy as np
+from pvtrace.data.fluro_red import _erf, emission
+
+
+class TestFluroRed:
+
+    def test_erf(self):
+        xs = (-3.0, -1.2, -0.5, -1e-3, 0.0, 1e-3, 0.5, 1.2, 3.0)
+        for x in xs:
+            assert abs(_erf(x) - math.erf(x)) < 1.5e-7
+        assert _erf(0.0) == 0.0
+        expected = [math.erf(x) for x in xs]
+        assert np.allclose(_erf(np.array(xs)), expected, rtol=0.0, atol=1.5e-7)
+
+    def test_emission(self):
+        # Reference using the exact erf with the same fit parameters.
+        a = 1.1477763237584664
+        b = 592.06478874548839
+        c = 19.981040318195117
+        d = 12.723704058786568
+        r2 = math.sqrt(2)
+        xs = np.linspace(200, 900, 701)
+        expected = np.array([
+            a * c * math.sqrt(2 * math.pi) / (2 * d)
+            * math.exp((c**2 / (2 * d**2)) - ((x - b) / d))
+            * (1.0 + math.erf((x - b) / (r2 * c) - c / (r2 * d)))
+            for x in xs
+        ])
+        spectrum = emission(xs)
+        assert np.allclose(spectrum, expected, rtol=0.0, atol=1.5e-5)
+        visible = expected > 1e-3
+        assert np.allclose(spectrum[visible], expected[visible], rtol=2e-3, atol=0.0)
+
+
+if __name__ == "__main__":
+    pass
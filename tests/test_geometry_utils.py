@@ -1,6 +1,6 @@
 import pytest
 import numpy as np
-from pvtrace.geometry.utils import angle_between, magnitude, norm, smallest_angle_between, close_to_zero, floats_close, ray_z_cylinder, EPS_ZERO
+from pvtrace.geometry.utils import allinrange, angle_between, is_ahead, intersection_point_is_ahead, magnitude, norm, smallest_angle_between, close_to_zero, floats_close, isclose, ray_z_cylinder, aabb_intersection, aabb_intersection_batch, EPS_ZERO
 
 class TestGeometryUtils:
     
@@ -21,6 +21,23 @@ class TestGeometryUtils:
         assert floats_close(a, a - 0.9*EPS_ZERO) == True
         assert floats_close(a, a) == True
 
+    def test_isclose(self):
+        for a, b in ((1.0, 1.0 + 1e-6), (1.0, 1.0 + 1e-4), (0.0, 1e-9), (-2.0, 2.0)):
+            assert isclose(a, b) == np.isclose(a, b)
+
+    def test_allinrange(self):
+        assert allinrange(0.0, (0.0, 1.0)) == True  # inclusive
+        assert allinrange(1.5, (0.0, 1.0)) == False
+        assert allinrange(np.array([0.2, 0.4, 1.0]), (0.0, 1.0)) == True
+        assert allinrange([0.2, -0.1], (0.0, 1.0)) == False
+
+    def test_is_ahead(self):
+        position, direction = (0.0, 0.0, 0.0), (0.0, 0.0, 1.0)
+        assert is_ahead(position, direction, (0.0, 0.0, 1.0)) == True
+        assert is_ahead(position, direction, (1.0, 0.0, -1.0)) == False
+        assert is_ahead(position, direction, position) == False
+        assert intersection_point_is_ahead(position, direction, (0.0, 1.0, 0.5)) == True
+
     def test_magnitude(self):
         v = (1.0, 1.0, 1.0)
         assert np.isclose(magnitude(v), np.sqrt(3.0))
@@ -100,6 +117,31 @@ class TestGeometryUtils:
         print(expected)
         assert all([np.allclose(a, b) for a, b in zip(expected, points)])
 
+    def test_aabb_intersection(self):
+        lower, upper = (-1.0, -2.0, -0.5), (1.0, 2.0, 0.5)
+        points = aabb_intersection(lower, upper, (-3.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+        assert np.allclose(points, ((-1.0, 0.0, 0.0), (1.0, 0.0, 0.0)))
+        # Starting inside, only the forward point
+        points = aabb_intersection(lower, upper, (0.0, 0.0, 0.0), (0.0, 0.0, -1.0))
+        assert np.allclose(points, ((0.0, 0.0, -0.5),))
+        # Parallel to and outside of the y slab
+        assert aabb_intersection(lower, upper, (-3.0, 3.0, 0.0), (1.0, 0.0, 0.0)) is None
+        # Diagonal miss
+        direction = tuple(norm((1.0, 1.0, 0.0)))
+        assert aabb_intersection(lower, upper, (0.0, -5.0, 0.0), direction) is None
+
+    def test_aabb_intersection_batch(self):
+        np.random.seed(4)
+        lower, upper = (0.0, -2.0, 1.0), (1.0, 2.0, 1.5)
+        positions = np.random.uniform(-3, 3, (200, 3))
+        directions = np.random.randn(200, 3)
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+        hit, tmin, tmax = aabb_intersection_batch(lower, upper, positions, directions)
+        for i, (p, d) in enumerate(zip(positions, directions)):
+            points = aabb_intersection(lower, upper, tuple(p), tuple(d))
+            assert hit[i] == bool(points)
+            if hit[i]:
+                assert np.allclose(points[-1], p + tmax[i] * d)
 
 
 if __name__ == "__main__":
@@ -21,6 +21,8 @@ class TestIntersection:
         inter1 = Intersection(coordsys=Node, hit=Node, point=(0.0, 0.0, 0.0), distance=0.0)
         inter2 = Intersection(coordsys=Node, hit=Node, point=(0.0, 0.0, 0.0), distance=0.0)
         assert inter1 == inter2
+        inter3 = Intersection(coordsys=Node, hit=Node, point=(0.0, 0.0, 1e-3), distance=0.0)
+        assert inter1 != inter3
         
 
 if __name__ == '__main__':
@@ -0,0 +1,47 @@
+import pytest
+import numpy as np
+from pvtrace.device.lsc import LSC
+
+
+class TestLSC:
+
+    def test_names_require_simulation(self):
+        lsc = LSC((5.0, 5.0, 1.0))
+        with pytest.raises(ValueError):
+            lsc.component_names()
+        with pytest.raises(ValueError):
+            lsc.light_names()
+
+    def test_add_after_simulate(self):
+        np.random.seed(0)
+        lsc = LSC((5.0, 5.0, 1.0))
+        lsc.simulate(200)
+        components = lsc.component_names()
+        lights = lsc.light_names()
+        assert components == {"Lumogen F Red 305", "Background"}
+        lsc.add_absorber("Extra", 0.1)
+        # The results are of the simulated scene until the next simulation
+        assert lsc.component_names() == components
+        assert lsc.light_names() == lights
+        assert lsc.summary() is not None
+        lsc.simulate(200)
+        # Components added after a simulation are traced alongside the defaults
+        assert {c.name for c in lsc._scene.component_nodes} == {
+            "Lumogen F Red 305",
+            "Background",
+            "Extra",
+        }
+        assert lsc.component_names() == components | {"Extra"}
+        assert len(lsc.spectrum(kind="first")) == 400
+
+    def test_add_before_simulate_replaces_defaults(self):
+        np.random.seed(0)
+        lsc = LSC((5.0, 5.0, 1.0))
+        lsc.add_absorber("Extra", 0.1)
+        lsc.simulate(100)
+        assert {c.name for c in lsc._scene.component_nodes} == {"Extra"}
+        assert lsc.component_names() == {"Extra"}
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,28 @@
+import pytest
+import functools
+import numpy as np
+from pvtrace.material.utils import cone, lambertian, isotropic, accepts_size
+
+
+class TestMaterialUtils:
+
+    def test_cone(self):
+        theta_max = np.radians(20)
+        assert np.shape(cone(theta_max)) == (3,)
+        directions = cone(theta_max, size=1000)
+        assert directions.shape == (1000, 3)
+        assert np.allclose(np.linalg.norm(directions, axis=1), 1.0)
+        assert np.all(directions[:, 2] >= np.cos(theta_max) - 1e-12)
+
+    def test_size_one(self):
+        for sampler in (isotropic, lambertian, functools.partial(cone, 0.1)):
+            assert sampler(size=1).shape == (1, 3)
+
+    def test_accepts_size(self):
+        assert accepts_size(functools.partial(cone, 0.1))
+        assert accepts_size(isotropic)
+        assert not accepts_size(lambda: (0.0, 0.0, 1.0))
+
+
+if __name__ == "__main__":
+    pass
@@ -139,3 +139,20 @@ class TestMesh:
         direction = (0, 0, 1.0)  # Travelling towards, is entering
         assert m.is_entering(position, direction) == True
 
+
+    def test_surface_query_is_cached(self):
+        m = Mesh(trimesh.creation.icosphere())
+        assert m.is_on_surface((0, 0, -1.0)) == True
+        cached = m._last_nearest
+        assert m.normal((0, 0, -1.0))[2] < 0.0
+        assert m._last_nearest is cached
+        # A different point is queried again
+        assert m.is_on_surface((0, 0, -0.9)) == False
+        assert m._last_nearest is not cached
+
+    def test_contains_uses_centred_bounds(self):
+        mesh = trimesh.creation.box((1.0, 1.0, 1.0))
+        mesh.apply_translation((5.0, 0.0, 0.0))
+        m = Mesh(mesh)  # vertices are centred on the centre of mass
+        assert m.contains((0.0, 0.0, 0.0)) == True
+        assert m.contains((5.0, 0.0, 0.0)) == False
@@ -1,4 +1,5 @@
 import pytest
+import functools
 import sys
 import os
 import numpy as np
@@ -7,6 +8,8 @@ from pvtrace.scene.scene import Scene
 from pvtrace.scene.node import Node
 from pvtrace.geometry.sphere import Sphere
 from pvtrace.light.ray import Ray
+from pvtrace.light.light import Light, rectangular_mask
+from pvtrace.material.distribution import Distribution
 
 
 class TestScene:
@@ -88,5 +91,43 @@ class TestScene:
         a_intersections = tuple(map(lambda x: x.to(root), scene_intersections))
         assert scene_intersections == a_intersections
 
+    def test_emit_batch(self):
+        root = Node(name="Root", geometry=Sphere(radius=10.0))
+        a = Node(name="A", parent=root, light=Light(name="A"))
+        b = Node(name="B", parent=root, light=Light(name="B"))
+        a.translate((1.0, 0.0, 0.0))
+        b.rotate(np.pi / 2, (1.0, 0.0, 0.0))
+        scene = Scene(root)
+        nm, pos, vec, source = scene.emit_batch(5, offset=1)
+        rays = list(scene.emit(6))[1:]
+        assert source.tolist() == [ray.source for ray in rays]
+        assert np.allclose(nm, [ray.wavelength for ray in rays])
+        assert np.allclose(pos, [ray.position for ray in rays])
+        assert np.allclose(vec, [ray.direction for ray in rays])
+
+    def test_emit_batch_size_aware_delegates(self):
+        x = np.linspace(400, 800, 101)
+        dist = Distribution(x, np.exp(-((x - 600.0) / 50.0) ** 2))
+        calls = []
+
+        def wavelength(size=None):
+            calls.append(size)
+            return dist.sample(np.random.uniform(size=size))
+
+        light = Light(
+            wavelength=wavelength,
+            position=functools.partial(rectangular_mask, 1.0, 2.0),
+        )
+        root = Node(name="Root", geometry=Sphere(radius=10.0))
+        Node(name="A", parent=root, light=light)
+        nm, pos, vec, source = Scene(root).emit_batch(50)
+        # The wavelength delegate draws the whole batch in one call
+        assert calls == [50]
+        assert nm.shape == (50,) and pos.shape == (50, 3)
+        assert np.all((nm >= 400) & (nm <= 800))
+        assert np.all(np.abs(pos[:, 0]) <= 1.0) and np.all(np.abs(pos[:, 1]) <= 2.0)
+        assert np.allclose(pos[:, 2], 0.0)
+
+
 if __name__ == '__main__':
     pass
@@ -28,6 +28,21 @@ class TestSphere:
         rd = (1.0, 0.0, 0.0)
         assert s.intersections(ro, rd) == ((-1.0, 0.0, 0.0), (1.0, 0.0, 0.0))
 
+    def test_intersection_from_inside_and_miss(self):
+        s = Sphere(radius=1)
+        assert s.intersections((0.0, 0.0, 0.0), (0.0, 0.0, 1.0)) == ((0.0, 0.0, 1.0),)
+        assert len(s.intersections((0.0, 2.0, 0.0), (1.0, 0.0, 0.0))) == 0
+
+    def test_intersections_batch(self):
+        s = Sphere(radius=1)
+        positions = [(-2.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 2.0, 0.0)]
+        directions = [(1.0, 0.0, 0.0), (0.0, 0.0, 1.0), (1.0, 0.0, 0.0)]
+        distances = s.intersections_batch(positions, directions)
+        assert distances.shape == (3, 2)
+        assert np.allclose(distances[0], (1.0, 3.0))
+        assert np.isnan(distances[1, 0]) and np.isclose(distances[1, 1], 1.0)
+        assert np.all(np.isnan(distances[2]))
+
     def test_normal(self):
         s = Sphere(radius=1)
         assert np.allclose(s.normal((0.0, 0.0, 1.0)), (0.0, 0.0, 1.0))
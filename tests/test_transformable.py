@@ -12,3 +12,39 @@ class TestTransformable:
         assert np.allclose(Transformable(location=(1, 1, 1)).location, (1, 1, 1))
         pose = np.random.random((4, 4))
         assert np.allclose(Transformable.from_pose(pose).pose, pose)
+
+    def test_translate_and_rotate_compose_pose(self):
+        from pvtrace.geometry.transformations import (
+            rotation_matrix,
+            translation_matrix,
+        )
+        t = Transformable(location=(1.0, 2.0, 3.0))
+        expected = translation_matrix((1.0, 2.0, 3.0))
+        t.rotate(0.3, (1.0, 1.0, 0.0))
+        expected = np.dot(rotation_matrix(0.3, (1.0, 1.0, 0.0), point=(1.0, 2.0, 3.0)), expected)
+        t.translate((-1.0, 0.5, 2.0))
+        expected = np.dot(translation_matrix((-1.0, 0.5, 2.0)), expected)
+        assert np.allclose(t.pose, expected)
+        assert np.allclose(t.location, (0.0, 2.5, 5.0))
+
+    def test_inverse_pose_follows_pose(self):
+        t = Transformable(location=(1.0, 2.0, 3.0))
+        t.rotate(0.3, (0.0, 1.0, 0.0))
+        assert np.allclose(np.dot(t.inverse_pose, t.pose), np.identity(4))
+        t.translate((1.0, 0.0, 0.0))
+        assert np.allclose(np.dot(t.inverse_pose, t.pose), np.identity(4))
+        t.pose[0:3, 3] = (0.0, 0.0, 0.0)  # in-place changes are detected too
+        assert np.allclose(np.dot(t.inverse_pose, t.pose), np.identity(4))
+
+    def test_translate_and_rotate_do_not_modify_previous_pose(self):
+        t = Transformable(location=(1.0, 2.0, 3.0))
+        before = t.pose
+        saved = before.copy()
+        t.translate((1.0, 0.0, 0.0))
+        assert t.pose is not before
+        assert np.array_equal(before, saved)
+        before = t.pose
+        saved = before.copy()
+        t.rotate(0.3, (0.0, 0.0, 1.0))
+        assert t.pose is not before
+        assert np.array_equal(before, saved)